@@ -0,0 +1,85 @@
+"""Cold-analysis benchmark for PDFAnalyzer ingestion.
+
+Compares the old two-pass miss path with single-pass ingestion, and the
+PyMuPDFLoader extraction backend with the native PyMuPDF backend.
+
+Usage:
+    python benchmarks/bench_pdf_ingest.py [models_dir] [--repeat N]
+"""
+
+import argparse
+import os
+import time
+
+from AutoDRP.utils import PDFAnalyzer, parse_pdf
+from langchain_community.document_loaders import PyMuPDFLoader
+
+
+def legacy_two_pass(analyzer: PDFAnalyzer, pdf_path: str):
+    """Reproduce the old analyze_content miss path: one parse for metadata, one for chunks."""
+    PyMuPDFLoader(pdf_path).load()
+    raw_docs = PyMuPDFLoader(pdf_path).load()
+    return analyzer.text_splitter.split_documents(raw_docs)
+
+
+def single_pass(analyzer: PDFAnalyzer, pdf_path: str):
+    """Current miss path: one parse shared by metadata and chunking."""
+    analyzer._documents_cache.clear()
+    analyzer._metadata_cache.clear()
+    return analyzer.ingest_pdf(pdf_path)["documents"]
+
+
+def loader_backend(analyzer: PDFAnalyzer, pdf_path: str):
+    return parse_pdf(pdf_path, analyzer.splitter_config, backend="loader")
+
+
+def native_backend(analyzer: PDFAnalyzer, pdf_path: str):
+    return parse_pdf(pdf_path, analyzer.splitter_config, backend="native")
+
+
+def native_backend_parallel(analyzer: PDFAnalyzer, pdf_path: str):
+    return parse_pdf(pdf_path, analyzer.splitter_config, backend="native", page_workers=os.cpu_count() or 1)
+
+
+def time_it(fn, analyzer: PDFAnalyzer, pdf_files, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for pdf_path in pdf_files:
+            fn(analyzer, pdf_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("models_dir", nargs="?", default="./models")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Disable the persistent store so every run measures a cold parse
+    analyzer = PDFAnalyzer(base_dir=args.models_dir, cache_dir=None)
+    pdf_files = analyzer.find_pdf_files()
+    if not pdf_files:
+        print(f"No PDF files found in {args.models_dir}")
+        return
+
+    legacy = time_it(legacy_two_pass, analyzer, pdf_files, args.repeat)
+    single = time_it(single_pass, analyzer, pdf_files, args.repeat)
+
+    print(f"PDFs: {len(pdf_files)} (best of {args.repeat})")
+    print(f"legacy two-pass : {legacy:.3f}s")
+    print(f"single-pass     : {single:.3f}s")
+    print(f"ratio           : {single / legacy:.2f}x")
+
+    loader = time_it(loader_backend, analyzer, pdf_files, args.repeat)
+    native = time_it(native_backend, analyzer, pdf_files, args.repeat)
+    parallel = time_it(native_backend_parallel, analyzer, pdf_files, args.repeat)
+
+    print(f"loader backend  : {loader:.3f}s")
+    print(f"native backend  : {native:.3f}s ({native / loader:.2f}x)")
+    print(f"native parallel : {parallel:.3f}s ({parallel / loader:.2f}x, pages/doc >= threshold only)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import atexit
 from AutoDRP.mcp_manager import MCPManager
 from AutoDRP.state import AutoDRP_state
 from AutoDRP.prompts import data_agent_prompt, env_agent_prompt, mcp_agent_prompt, code_agent_prompt, analyzing_prompt
-from AutoDRP.utils import get_pdf_analyzer
+from AutoDRP.utils import get_pdf_analyzer, get_pdf_tools, make_async_tool
 
 
 # =============================================================================
@@ -108,8 +108,11 @@ def create_pdf_tools():
             if not pdf_files:
                 return "No PDF files found in models directory"
             
+            # Parse and chunk every uncached PDF in parallel
+            pdf_analyzer.ingest_pdfs(pdf_files)
+            
             results = []
-            for pdf_path in pdf_files[:3]:
+            for pdf_path in pdf_files:
                 analysis = pdf_analyzer.analyze_content(pdf_path, query)
                 if "error" not in analysis:
                     pdf_name = os.path.basename(pdf_path)
@@ -135,7 +138,12 @@ def create_pdf_tools():
         except Exception as e:
             return f"Error finding PDFs: {str(e)}"
     
-    return [analyze_pdfs, find_pdf_files]
+    # Section, context and multi-query tools are shared with utils.get_pdf_tools()
+    shared_tools = {t.name: t for t in get_pdf_tools()}
+    
+    return [make_async_tool(t, pdf_analyzer) for t in [analyze_pdfs, find_pdf_files]] + [
+        shared_tools[name] for name in ["get_pdf_section", "get_pdf_context", "analyze_pdf_queries"]
+    ]
 
 async def create_agent(agent_name: str, tools_dict: Dict, handoff_tools: Dict):
     """Create a single agent."""
@@ -205,7 +213,8 @@ def print_status(tools, agents, failed_agents):
     if connected:
         print(f"📊 MCP Servers: {', '.join(connected)}")
     if failed:
-        print(f"❌ Failed MCP: {', '.join(failed)}")
+        reasons = [f"{s} ({mcp_manager.server_status.get(s, {}).get('status', 'failed')})" for s in failed]
+        print(f"❌ Failed MCP: {', '.join(reasons)}")
     
     # Agent status
     if agents:
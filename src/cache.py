@@ -0,0 +1,180 @@
+"""Size-bounded in-memory caches for PDF analysis."""
+
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Root of AutoDRP's on-disk caches (PDF chunk store, vectors, embeddings, MCP tool schemas)
+DEFAULT_CACHE_DIR = os.getenv('AUTODRP_CACHE_DIR', './.autodrp_cache')
+
+
+def approx_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate resident size of an object graph in bytes."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, mmap.mmap):
+        # Mapped pages are not in sys.getsizeof; count the mapped length
+        return size + (0 if obj.closed else len(obj))
+    if isinstance(obj, dict):
+        return size + sum(approx_size(k, _seen) + approx_size(v, _seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(approx_size(item, _seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        return size + approx_size(vars(obj), _seen)
+    return size
+
+
+class BoundedCache:
+    """Thread-safe LRU cache bounded by entry count and approximate bytes, with optional TTL.
+
+    Entries past `ttl` seconds are treated as missing. `on_evict(key, value)` is called
+    for every entry dropped by eviction, expiry or explicit removal.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizeof: Callable[[Any], int] = approx_size,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+
+        self._lock = threading.RLock()
+        # key -> (value, size, stored_at)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _remove(self, key: Hashable) -> Any:
+        value, size, _ = self._data.pop(key)
+        self.resident_bytes -= size
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+        return value
+
+    def _enforce_limits(self):
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            # The newest entry is always kept, even if it alone exceeds max_bytes
+            or (self.max_bytes is not None and self.resident_bytes > self.max_bytes and len(self._data) > 1)
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None, record_stats: bool = True) -> Any:
+        """Return a live entry and mark it recently used.
+
+        Pass record_stats=False when the caller decides hit/miss itself (see record_lookup).
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._expired(entry[2]):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if record_stats:
+                    self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            if record_stats:
+                self.hits += 1
+            return entry[0]
+
+    def record_lookup(self, hit: bool):
+        """Count a lookup resolved by the caller, e.g. inside a nested entry."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def adjust(self, key: Hashable, delta: int):
+        """Account for an entry whose value was mutated in place, then enforce limits.
+
+        The mutation counts as a write: the entry's TTL starts over.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return
+            value, size, _ = entry
+            self._data[key] = (value, size + delta, time.monotonic())
+            self.resident_bytes += delta
+            self._enforce_limits()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                _, old_size, _ = self._data.pop(key)
+                self.resident_bytes -= old_size
+            self._data[key] = (value, size, time.monotonic())
+            self.resident_bytes += size
+            self._enforce_limits()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[2])
+
+    def __delitem__(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._remove(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and resident size."""
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "resident_bytes": self.resident_bytes
+            }
@@ -0,0 +1,204 @@
+"""Embedding providers with an on-disk cache for PDF retrieval."""
+
+import asyncio
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from .cache import BoundedCache
+from .pdf_index import tokenize
+
+# Embedding backend: "openai" (remote) or "hashing" (local, deterministic)
+DEFAULT_EMBEDDING_PROVIDER = os.getenv('AUTODRP_EMBEDDINGS', 'openai')
+
+# Limits of the in-memory vector cache in front of SQLite (vectors held as float32 arrays)
+DEFAULT_MEMORY_CACHE_LIMITS: Dict[str, Any] = {'max_entries': None, 'max_bytes': 64 * 1024 * 1024, 'ttl': None}
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic local embedder using signed feature hashing of unigrams and bigrams.
+
+    Needs no network or model download, so air-gapped nodes and benchmarks can run
+    the retrieval path. Vectors are L2-normalized with sublinear term weighting.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def _embed(self, text: str) -> List[float]:
+        terms = tokenize(text)
+        features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+        counts: Dict[str, int] = {}
+        for feature in features:
+            counts[feature] = counts.get(feature, 0) + 1
+
+        vector = [0.0] * self.dim
+        for feature, count in counts.items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dim] += sign * (1.0 + math.log(count))
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap an embedder with a disk-backed cache keyed by (model, text hash).
+
+    Cache misses are deduplicated and sent in batches of `batch_size`, with at most
+    `max_concurrency` requests in flight. Recently used vectors are kept in a bounded
+    in-memory cache (`memory_cache`, limits from `memory_limits`) in front of SQLite;
+    with cache_dir=None that bounded cache is the only one.
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, cache_dir: Optional[str] = None,
+                 batch_size: int = 64, max_concurrency: int = 4,
+                 memory_limits: Optional[Dict[str, Any]] = None):
+        self.underlying = underlying
+        self.model = model
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self.memory_cache = BoundedCache(**{**DEFAULT_MEMORY_CACHE_LIMITS, **(memory_limits or {})})
+        self._conn = None
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(cache_dir, "embeddings.sqlite3"), check_same_thread=False, timeout=30
+            )
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    " model TEXT NOT NULL,"
+                    " text_hash TEXT NOT NULL,"
+                    " vector BLOB NOT NULL,"
+                    " PRIMARY KEY (model, text_hash))"
+                )
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        for h in hashes:
+            vector = self.memory_cache.get(h)
+            if vector is not None:
+                found[h] = vector.tolist()
+        missing = [h for h in hashes if h not in found]
+        if self._conn is None or not missing:
+            return found
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                part = missing[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(part))})",
+                    [self.model, *part]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    self.memory_cache[text_hash] = vector
+                    found[text_hash] = vector.tolist()
+        return found
+
+    def _save(self, vectors: Dict[str, List[float]]):
+        packed = {h: array('f', v) for h, v in vectors.items()}
+        for text_hash, vector in packed.items():
+            self.memory_cache[text_hash] = vector
+        if self._conn is None or not packed:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(self.model, h, v.tobytes()) for h, v in packed.items()]
+            )
+
+    def _pending_batches(self, texts: List[str]):
+        """Return text hashes, cached vectors and deduplicated miss batches."""
+        hashes = [self._text_hash(text) for text in texts]
+        cached = self._lookup(list(dict.fromkeys(hashes)))
+
+        misses: Dict[str, str] = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached:
+                misses.setdefault(text_hash, text)
+
+        items = list(misses.items())
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        return hashes, cached, batches
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, batches = self._pending_batches(texts)
+
+        def _embed_batch(batch):
+            return dict(zip((h for h, _ in batch), self.underlying.embed_documents([t for _, t in batch])))
+
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = list(executor.map(_embed_batch, batches))
+        else:
+            results = [_embed_batch(batch) for batch in batches]
+
+        for vectors in results:
+            self._save(vectors)
+            cached.update(vectors)
+
+        return [cached[h] for h in hashes]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, batches = await asyncio.to_thread(self._pending_batches, texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _embed_batch(batch):
+            async with semaphore:
+                vectors = await self.underlying.aembed_documents([t for _, t in batch])
+            return dict(zip((h for h, _ in batch), vectors))
+
+        for vectors in await asyncio.gather(*(_embed_batch(batch) for batch in batches)):
+            await asyncio.to_thread(self._save, vectors)
+            cached.update(vectors)
+
+        return [cached[h] for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def get_embeddings(provider: Optional[str] = None, cache_dir: Optional[str] = None) -> CachedEmbeddings:
+    """Build the configured embedder wrapped with the (model, text hash) cache."""
+    provider = provider or DEFAULT_EMBEDDING_PROVIDER
+
+    if provider == "hashing":
+        underlying = HashingEmbeddings()
+        model = underlying.model
+    elif provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        underlying = OpenAIEmbeddings()
+        model = f"openai:{underlying.model}"
+    else:
+        raise ValueError(f"Unknown embedding provider: {provider}")
+
+    return CachedEmbeddings(underlying, model, cache_dir=cache_dir)
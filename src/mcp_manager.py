@@ -1,13 +1,20 @@
 """Simplified MCP server management."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import asyncio
 import subprocess
 import os
+import time
 import json
 import atexit
+import random
 import docker
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import Tool
+
+from .mcp_pool import MCPSessionPool, PooledSession
+from .mcp_schema_cache import ToolSchemaCache, dump_tools
 
 
 # .env에서 MCP 목록 가져옴.
@@ -28,10 +35,27 @@ class MCPManager:
     
     def __init__(self):
         self.clients = {}
+        self.pools: Dict[str, MCPSessionPool] = {}
         self.tools = {}
+        # Per-server outcome of the last initialization: status, detail, elapsed seconds
+        self.server_status: Dict[str, Dict[str, Any]] = {}
         self._initialized = False
         self.docker_client = None
         self.config = load_mcp_config()
+        # Tool schemas persisted across boots; revalidated in the background
+        self.schema_cache: Optional[ToolSchemaCache] = None
+        if self.config.get("settings", {}).get("schema_cache", True):
+            try:
+                self.schema_cache = ToolSchemaCache()
+            except Exception as e:
+                print(f"[MCP] Tool schema cache unavailable: {e}")
+        self._revalidations = set()
+        # Running containers (name -> image ID) from one Docker API call, shared for a short TTL
+        self._container_snapshot: Optional[Dict[str, str]] = None
+        self._snapshot_time = 0.0
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Background health checks and reconnects, started once servers are initialized
+        self._supervisor: Optional[asyncio.Task] = None
         
         try:
             self.docker_client = docker.from_env()
@@ -44,7 +68,14 @@ class MCPManager:
     
     
     async def initialize_all_servers(self):
-        """Initialize all MCP servers."""
+        """Initialize all MCP servers.
+        
+        Servers are connected concurrently, each bounded by its own connection_timeout,
+        so startup takes as long as the slowest server rather than the sum. Each server
+        gets one attempt; servers that fail, time out or are not running get an empty
+        tool list (see server_status) and are left to the background supervisor, which
+        retries them with backoff.
+        """
         if self._initialized:
             return self.tools
         
@@ -54,16 +85,26 @@ class MCPManager:
             # Wait for containers to be ready
             await self._wait_for_containers()
             
-            # Connect to all container servers
-            for container_name in container_names:
-                if not container_name:
-                    continue
-                
-                tools = await self._connect_container_server(container_name)
+            # Connect to all container servers at once
+            names = [name for name in container_names if name]
+            results = await asyncio.gather(
+                *(self._connect_container_server(name) for name in names), return_exceptions=True
+            )
+            for container_name, tools in zip(names, results):
+                if isinstance(tools, BaseException):
+                    print(f"[MCP] Failed to connect to container {container_name}: {tools}")
+                    self._set_status(container_name, "error", str(tools))
+                    tools = []
                 self.tools[container_name] = tools
             
             self._initialized = True
-            print("[MCP] All container servers initialized")
+            self._start_supervisor()
+            connected = [name for name in names if self.tools[name]]
+            failed = [name for name in names if not self.tools[name]]
+            print(f"[MCP] Container servers initialized: {len(connected)}/{len(names)} connected")
+            for name in failed:
+                status = self.server_status.get(name, {})
+                print(f"[MCP]   {name}: {status.get('status', 'failed')} {status.get('detail', '')}".rstrip())
             return self.tools
             
         except Exception as e:
@@ -77,10 +118,8 @@ class MCPManager:
             return
             
         try:
-            running_containers = []
-            for name in container_names:
-                if self._is_container_running(name):
-                    running_containers.append(name)
+            snapshot = await self._get_container_snapshot()
+            running_containers = [name for name in container_names if name in snapshot]
             
             if running_containers:
                 print(f"[MCP] Found running containers: {running_containers}")
@@ -90,18 +129,63 @@ class MCPManager:
         except Exception as e:
             print(f"[MCP] Error checking containers: {e}")
     
-    async def _connect_container_server(self, container_name: str):
-        """Connect to a containerized MCP server."""
+    def _set_status(self, container_name: str, status: str, detail: str = "", started: Optional[float] = None):
+        """Record the outcome of a server connection attempt."""
+        self.server_status[container_name] = {
+            "status": status,
+            "detail": detail,
+            "elapsed": round(time.monotonic() - started, 2) if started is not None else None
+        }
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter: half the capped delay, plus up to half again at random."""
+        settings = self.config.get("settings", {})
+        delay = min(settings.get("retry_backoff_max", 30), settings.get("retry_backoff", 1.0) * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    async def _connect_with_retry(self, container_name: str):
+        """Connect to a server, retrying failed, timed-out or not-running attempts with backoff.
+        
+        Used by the supervisor only, so boot is never held up by retries.
+        """
+        retries = self.config.get("settings", {}).get("retry_count", 3)
+        retryable = {"timeout", "error", "not_running"}
+        tools = []
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff_delay(attempt - 1))
+                print(f"[MCP] Retrying {container_name} (attempt {attempt + 1}/{retries + 1})")
+            # Retries need container state newer than the failed attempt's
+            tools = await self._connect_container_server(
+                container_name, snapshot_after=time.monotonic() if attempt else 0.0
+            )
+            if tools or self.server_status.get(container_name, {}).get("status") not in retryable:
+                return tools
+        return tools
+    
+    async def _connect_container_server(self, container_name: str, snapshot_after: float = 0.0):
+        """Connect to a containerized MCP server, bounded end to end by connection_timeout."""
+        started = time.monotonic()
+        timeout = self.config.get("settings", {}).get("connection_timeout", 15)
+        
+        # Close the pool of a previous failed attempt before replacing it
+        previous = self.pools.pop(container_name, None)
+        if previous is not None:
+            await previous.close()
         try:
-            # Check if container is running
-            if not self._is_container_running(container_name):
+            # Check if container is running against the shared container snapshot
+            snapshot = await asyncio.wait_for(self._get_container_snapshot(snapshot_after), timeout=timeout)
+            image_id = snapshot.get(container_name)
+            if image_id is None:
                 print(f"[MCP] Container {container_name} is not running")
+                self._set_status(container_name, "not_running", started=started)
                 return []
             
             # Get server configuration from mcp.json
             server_config = self.config.get("servers", {}).get(container_name, {})
             if not server_config:
                 print(f"[MCP] No configuration found for {container_name}")
+                self._set_status(container_name, "not_configured", started=started)
                 return []
             
             # Build docker exec command from configuration
@@ -117,46 +201,222 @@ class MCPManager:
                 }
             }
             
-            # Create MCP client and get real tools
+            # Create MCP client; tools run over pooled long-lived sessions instead of
+            # spawning a docker exec and handshake per call
             client = MultiServerMCPClient(client_config)
             self.clients[container_name] = client
+            pool_settings = self.config.get("settings", {}).get("session_pool", {})
+            pool = MCPSessionPool(container_name, client, **pool_settings)
+            self.pools[container_name] = pool
             
-            # Get real MCP tools from the server with timeout
+            # Build tools from cached schemas when this exact config and image were seen
+            # before; the live server is checked in the background instead of at boot
+            cache_key = ToolSchemaCache.key(container_name, client_config, image_id) if image_id else None
+            cached = self.schema_cache.get(cache_key) if self.schema_cache and cache_key else None
+            if cached is not None:
+                tools = self._build_tools(pool, cached)
+                print(f"[MCP] Loaded {container_name} from schema cache: {len(tools)} tools")
+                self._set_status(container_name, "connected", f"{len(tools)} tools (cached)", started)
+                task = asyncio.create_task(
+                    self._revalidate_schemas(container_name, pool, cache_key, cached, tools, timeout),
+                    name=f"mcp-revalidate-{container_name}"
+                )
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidations.discard)
+                return tools
+            
+            # Get real MCP tools from the server within what is left of the timeout
             try:
-                timeout = self.config.get("settings", {}).get("connection_timeout", 15)
-                tools = await asyncio.wait_for(client.get_tools(), timeout=timeout)
+                remaining = max(0.0, timeout - (time.monotonic() - started))
+                schemas = await asyncio.wait_for(self._list_tool_schemas(pool), timeout=remaining)
+                if self.schema_cache and cache_key:
+                    self.schema_cache.put(cache_key, schemas)
+                tools = self._build_tools(pool, schemas)
                 print(f"[MCP] Connected to container {container_name}: {len(tools)} tools")
+                self._set_status(container_name, "connected", f"{len(tools)} tools", started)
                 return tools
             except asyncio.TimeoutError:
                 print(f"[MCP] Connection to {container_name} timed out after {timeout} seconds")
+                self._set_status(container_name, "timeout", f"after {timeout}s", started)
                 return []
             except Exception as conn_error:
                 print(f"[MCP] Connection error for {container_name}: {conn_error}")
+                self._set_status(container_name, "error", str(conn_error), started)
                 return []
             
+        except asyncio.TimeoutError:
+            print(f"[MCP] Connection to {container_name} timed out after {timeout} seconds")
+            self._set_status(container_name, "timeout", f"after {timeout}s", started)
+            return []
         except Exception as e:
             print(f"[MCP] Failed to connect to container {container_name}: {e}")
+            self._set_status(container_name, "error", str(e), started)
             return []
     
-    def _is_container_running(self, container_name: str) -> bool:
-        """Check if a Docker container is running."""
+    async def _list_tool_schemas(self, pool: MCPSessionPool) -> List[Tool]:
+        """List every tool a server exposes, following pagination cursors."""
+        schemas: List[Tool] = []
+        cursor = None
+        while True:
+            result = await pool.call("list_tools", cursor=cursor)
+            schemas.extend(result.tools or [])
+            cursor = result.nextCursor
+            if not cursor:
+                return schemas
+    
+    @staticmethod
+    def _build_tools(pool: MCPSessionPool, schemas: List[Tool]) -> list:
+        """Wrap MCP tool schemas as LangChain tools that call through the session pool."""
+        session = PooledSession(pool)
+        return [convert_mcp_tool_to_langchain_tool(session, schema) for schema in schemas]
+    
+    async def _revalidate_schemas(self, container_name: str, pool: MCPSessionPool, cache_key: str,
+                                  cached: List[Tool], tools: list, timeout: float):
+        """Compare cached tool schemas with the live server and refresh them if they differ.
+        
+        The tool list handed out at boot is updated in place, so later lookups through
+        self.tools see the live schemas; agents already built keep the tools they were
+        given until the app is recreated.
+        """
+        try:
+            live = await asyncio.wait_for(self._list_tool_schemas(pool), timeout=timeout)
+        except Exception as e:
+            detail = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            print(f"[MCP] Could not revalidate cached tools for {container_name}: {detail}")
+            status = self.server_status.get(container_name, {})
+            status["detail"] = f"{len(tools)} tools (cached, unverified)"
+            return
+        
+        if dump_tools(live) == dump_tools(cached):
+            return
+        self.schema_cache.put(cache_key, live)
+        tools[:] = self._build_tools(pool, live)
+        print(f"[MCP] Tool schemas changed for {container_name}: {len(tools)} tools; "
+              f"cache refreshed, existing agents update on restart")
+        status = self.server_status.get(container_name, {})
+        status["detail"] = f"{len(tools)} tools (refreshed)"
+    
+    async def _get_container_snapshot(self, taken_after: float = 0.0) -> Dict[str, str]:
+        """Map running container names to image IDs.
+        
+        One `containers.list` call (run in a thread) answers every container check for
+        `docker_status_ttl` seconds; concurrent callers share the in-flight request.
+        Pass taken_after (a time.monotonic() value) to skip snapshots older than it.
+        """
+        ttl = self.config.get("settings", {}).get("docker_status_ttl", 5)
+        if (self._container_snapshot is not None and self._snapshot_time >= taken_after
+                and time.monotonic() - self._snapshot_time < ttl):
+            return self._container_snapshot
+        
+        task = self._snapshot_task
+        if (task is None or task.done() or task.get_loop() is not asyncio.get_running_loop()
+                or self._snapshot_time < taken_after):
+            task = self._snapshot_task = asyncio.ensure_future(asyncio.to_thread(self._list_running_containers))
+        # Shielded so one caller timing out does not cancel the request for the others
+        snapshot = await asyncio.shield(task)
+        if snapshot is not None:
+            self._container_snapshot = snapshot
+            self._snapshot_time = time.monotonic()
+        return snapshot or {}
+    
+    def _list_running_containers(self) -> Optional[Dict[str, str]]:
+        """Return running container names mapped to image IDs, or None on Docker errors."""
         try:
             if not self.docker_client:
-                return False
-            container = self.docker_client.containers.get(container_name)
-            return container.status == "running"
-        except docker.errors.NotFound:
-            return False
+                return None
+            # Low-level list: one API round trip, no per-container inspect
+            return {
+                name.lstrip("/"): container.get("ImageID", "")
+                for container in self.docker_client.api.containers()
+                for name in container.get("Names", [])
+            }
         except Exception as e:
-            print(f"[MCP] Error checking container {container_name}: {e}")
-            return False
+            print(f"[MCP] Error listing containers: {e}")
+            return None
     
     
+    def _start_supervisor(self):
+        """Start the background health-check loop unless disabled (health_check_interval <= 0)."""
+        interval = self.config.get("settings", {}).get("health_check_interval", 30)
+        if interval <= 0 or (self._supervisor is not None and not self._supervisor.done()):
+            return
+        self._supervisor = asyncio.create_task(self._supervise(interval), name="mcp-supervisor")
+    
+    async def _supervise(self, interval: float):
+        """Every interval, ping live sessions and reconnect servers that are down.
+        
+        Tools hold their server's pool rather than a session, so once a dropped session
+        is replaced (for example after a container restart) the same tool objects keep
+        working without agents being rebuilt.
+        """
+        # The first pass comes one backoff step after boot, to pick up servers that failed it
+        delay = self._backoff_delay(0)
+        while True:
+            await asyncio.sleep(delay)
+            delay = interval
+            names = [name for name in container_names if name]
+            await asyncio.gather(*(self._check_server(name) for name in names), return_exceptions=True)
+    
+    async def _check_server(self, container_name: str):
+        """Health-check one server, reconnecting or re-establishing its session as needed."""
+        timeout = self.config.get("settings", {}).get("connection_timeout", 15)
+        
+        if not self.tools.get(container_name):
+            if self.server_status.get(container_name, {}).get("status") == "not_configured":
+                return
+            tools = await self._connect_with_retry(container_name)
+            if tools:
+                self.tools[container_name] = tools
+                print(f"[MCP] Reconnected {container_name}: {len(tools)} tools "
+                      f"(available to agents created from now on)")
+            return
+        
+        pool = self.pools.get(container_name)
+        if pool is None:
+            return
+        dropped = await pool.ping(timeout)
+        if not dropped and self.server_status.get(container_name, {}).get("status") != "disconnected":
+            return
+        
+        # A session stopped answering: open a fresh one so the next tool call does not fail
+        print(f"[MCP] Session to {container_name} dropped; reconnecting")
+        self._set_status(container_name, "reconnecting")
+        retries = self.config.get("settings", {}).get("retry_count", 3)
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff_delay(attempt - 1))
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(pool.call("send_ping"), timeout=timeout)
+            except Exception as e:
+                self._set_status(container_name, "disconnected", str(e) or type(e).__name__, started)
+                continue
+            print(f"[MCP] Session to {container_name} re-established")
+            self._set_status(container_name, "connected", f"{len(self.tools[container_name])} tools (reconnected)", started)
+            return
+        print(f"[MCP] Could not re-establish {container_name}; will retry in the next health check")
+    
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return session pool statistics per server."""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+    
     def stop_all_servers(self):
         """Stop all server connections."""
         # Note: Docker containers are managed externally
-        # This only cleans up client connections
+        # This only cleans up client connections and pooled sessions
+        supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None and not supervisor.done():
+            try:
+                supervisor.get_loop().call_soon_threadsafe(supervisor.cancel)
+            except RuntimeError:
+                pass
+        for pool in self.pools.values():
+            pool.shutdown()
+        self.pools.clear()
+        self._revalidations.clear()
+        self._container_snapshot = None
         self.clients.clear()
         self.tools.clear()
+        self.server_status.clear()
         self._initialized = False
         print("[MCP] Cleared all server connections")
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Pooled long-lived MCP client sessions."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import anyio
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+# Session methods safe to retry on a fresh session after any transport failure
+_IDEMPOTENT_METHODS = frozenset({"list_tools", "send_ping"})
+
+# Raised when writing to a session whose stream is already closed: the request was never sent
+_SEND_FAILURES = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+class _PoolSlot:
+    """One held session and its bookkeeping."""
+
+    def __init__(self):
+        self.session = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.error: Optional[Exception] = None
+        self.broken = False
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+
+class MCPSessionPool:
+    """Long-lived stdio sessions to one MCP server, shared by concurrent tool calls.
+
+    Each session keeps its `docker exec` process and MCP handshake open, so a tool call
+    costs one request/response instead of a process spawn plus handshake. Calls are
+    multiplexed over a session (MCP requests carry ids) up to `max_calls_per_session`;
+    beyond that, more sessions are opened up to `max_sessions`. Sessions idle for
+    `idle_timeout` seconds are closed, and a session whose transport fails is dropped
+    and replaced on the next call.
+    """
+
+    def __init__(self, server_name: str, client: Any, max_sessions: int = 2,
+                 max_calls_per_session: int = 8, idle_timeout: float = 300.0):
+        self.server_name = server_name
+        self.client = client
+        self.max_sessions = max_sessions
+        self.max_calls_per_session = max_calls_per_session
+        self.idle_timeout = idle_timeout
+
+        self._slots: List[_PoolSlot] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self.opened = 0
+        self.reaped = 0
+        self.replaced = 0
+
+    def _bind_loop(self):
+        # Sessions, events and locks belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = []
+            self._lock = asyncio.Lock()
+            self._reaper = None
+
+    async def _hold(self, slot: _PoolSlot):
+        """Keep a session open until asked to close; runs as its own task."""
+        try:
+            async with self.client.session(self.server_name) as session:
+                slot.session = session
+                slot.ready.set()
+                await slot.closing.wait()
+        except Exception as e:
+            slot.error = e
+        finally:
+            slot.broken = True
+            slot.ready.set()
+
+    async def _open(self) -> _PoolSlot:
+        slot = _PoolSlot()
+        slot.task = asyncio.create_task(self._hold(slot), name=f"mcp-session-{self.server_name}")
+        try:
+            await slot.ready.wait()
+        except BaseException:
+            slot.closing.set()
+            slot.task.cancel()
+            raise
+        if slot.broken:
+            raise ConnectionError(f"Could not open MCP session to {self.server_name}: {slot.error}")
+        self.opened += 1
+        return slot
+
+    async def _acquire(self) -> _PoolSlot:
+        self._bind_loop()
+        async with self._lock:
+            self._slots = [slot for slot in self._slots if not slot.broken]
+            slot = min(self._slots, key=lambda s: s.in_flight, default=None)
+            if slot is None or (slot.in_flight >= self.max_calls_per_session and len(self._slots) < self.max_sessions):
+                slot = await self._open()
+                self._slots.append(slot)
+            slot.in_flight += 1
+            if self._reaper is None or self._reaper.done():
+                self._reaper = asyncio.create_task(self._reap(), name=f"mcp-reaper-{self.server_name}")
+            return slot
+
+    def _discard(self, slot: _PoolSlot):
+        slot.broken = True
+        slot.closing.set()
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """Run a ClientSession method on a pooled session.
+
+        Protocol errors (McpError) mean the server answered and the session is kept,
+        except a closed connection. Any other failure drops the session. The call is
+        retried once on a fresh session if the request was never sent, or if the
+        method is idempotent; tool calls that may have reached the server are not
+        retried, since they can have side effects.
+        """
+        for attempt in range(2):
+            slot = await self._acquire()
+            try:
+                return await getattr(slot.session, method)(*args, **kwargs)
+            except McpError as e:
+                if e.error.code == CONNECTION_CLOSED:
+                    self._discard(slot)
+                    self.replaced += 1
+                raise
+            except Exception as e:
+                self._discard(slot)
+                self.replaced += 1
+                if attempt or not (isinstance(e, _SEND_FAILURES) or method in _IDEMPOTENT_METHODS):
+                    raise
+            finally:
+                slot.in_flight -= 1
+                slot.last_used = time.monotonic()
+
+    async def ping(self, timeout: float = 10.0) -> int:
+        """Ping each idle session and drop those that do not answer.
+
+        Pings do not count as use, so idle sessions are still reaped on schedule.
+        Returns the number of sessions dropped, including any whose transport closed
+        on its own since the last check.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            return 0
+        closed = sum(1 for slot in self._slots if slot.broken)
+        self._slots = [slot for slot in self._slots if not slot.broken]
+        dropped = 0
+        for slot in [slot for slot in self._slots if not slot.broken and slot.in_flight == 0]:
+            slot.in_flight += 1
+            try:
+                await asyncio.wait_for(slot.session.send_ping(), timeout)
+            except McpError as e:
+                # Any answer other than a closed connection means the server is alive
+                if e.error.code == CONNECTION_CLOSED:
+                    self._discard(slot)
+                    dropped += 1
+            except Exception:
+                self._discard(slot)
+                dropped += 1
+            finally:
+                slot.in_flight -= 1
+        self.replaced += dropped
+        return closed + dropped
+
+    async def _reap(self):
+        """Close sessions idle for longer than idle_timeout; exits once the pool is empty."""
+        while self._slots:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+            now = time.monotonic()
+            for slot in list(self._slots):
+                if slot.in_flight == 0 and now - slot.last_used > self.idle_timeout:
+                    self._slots.remove(slot)
+                    self._discard(slot)
+                    self.reaped += 1
+
+    async def close(self):
+        """Close every session and wait for their processes to exit."""
+        slots, self._slots = self._slots, []
+        for slot in slots:
+            self._discard(slot)
+        if self._reaper is not None:
+            self._reaper.cancel()
+        await asyncio.gather(*(slot.task for slot in slots if slot.task), return_exceptions=True)
+
+    def shutdown(self):
+        """Signal every session to close from synchronous code (atexit, signal handlers)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        def _close_all():
+            for slot in self._slots:
+                self._discard(slot)
+            self._slots = []
+            if self._reaper is not None:
+                self._reaper.cancel()
+
+        try:
+            loop.call_soon_threadsafe(_close_all)
+        except RuntimeError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return live session counts and lifetime counters."""
+        live = [slot for slot in self._slots if not slot.broken]
+        return {
+            "sessions": len(live),
+            "in_flight": sum(slot.in_flight for slot in live),
+            "opened": self.opened,
+            "reaped": self.reaped,
+            "replaced": self.replaced
+        }
+
+
+class PooledSession:
+    """ClientSession stand-in that routes list_tools/call_tool through an MCPSessionPool.
+
+    Passing it to load_mcp_tools yields tools that use the pool for every call.
+    """
+
+    def __init__(self, pool: MCPSessionPool):
+        self.pool = pool
+
+    async def list_tools(self, *args, **kwargs):
+        return await self.pool.call("list_tools", *args, **kwargs)
+
+    async def call_tool(self, *args, **kwargs):
+        return await self.pool.call("call_tool", *args, **kwargs)
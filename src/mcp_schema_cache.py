@@ -0,0 +1,64 @@
+"""On-disk cache of MCP tool schemas."""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from mcp.types import Tool
+
+from .cache import DEFAULT_CACHE_DIR
+
+
+class ToolSchemaCache:
+    """Tool listings per MCP server, keyed by server config and container image ID.
+
+    A rebuilt or re-tagged image, or any change to the command, args or transport,
+    yields a new key, so a stale listing is never served for a different server.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = os.path.join(cache_dir, "mcp_tools")
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(server_name: str, client_config: Dict[str, Any], image_id: str) -> str:
+        """Cache key for a server's connection config and container image."""
+        payload = json.dumps({'server': server_name, 'config': client_config, 'image': image_id}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Tool]]:
+        """Return cached tool schemas, or None if absent or unreadable."""
+        try:
+            with open(self._path(key), 'r') as f:
+                return [Tool.model_validate(tool) for tool in json.load(f)]
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, tools: List[Tool]) -> bool:
+        """Persist tool schemas atomically; returns False if they could not be written."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(dump_tools(tools), f)
+                os.replace(tmp_path, path)
+                return True
+            except OSError:
+                # The cache is an optimization; a full or read-only disk must not fail the connection
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return False
+
+
+def dump_tools(tools: List[Tool]) -> List[Dict[str, Any]]:
+    """JSON-ready form of MCP tool schemas, used for storage and comparison."""
+    return [tool.model_dump(mode='json', exclude_none=True) for tool in tools]
@@ -0,0 +1,241 @@
+"""Compact columnar storage for a PDF's split chunks."""
+
+import mmap
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from langchain_core.documents import Document
+
+# UTF-8 chunk text: in-memory bytes, or a read-only mapping of a store file
+ChunkBuffer = Union[bytes, mmap.mmap]
+
+
+class ChunkTable(Sequence):
+    """A document's chunks as one UTF-8 text buffer plus columnar metadata.
+
+    Chunk i's text is the UTF-8 bytes text_buffer[offsets[i]:offsets[i + 1]]. The buffer
+    is `bytes` for freshly parsed tables and a read-only mmap for tables loaded from the
+    persistent store, so processes that open the same store share one physical copy
+    and `view()` / `snippet()` read from it without decoding whole chunks. Metadata values identical for
+    every chunk (source path, PDF properties, total_chunks...) are stored once in
+    `shared`; the rest become per-chunk columns, integer columns as arrays and other
+    values dictionary-encoded. Indexing or iterating yields LangChain Documents built
+    on demand, so the table can be handed to code expecting a list of Documents;
+    internal paths should read `text()`, `texts()` and `column()` instead.
+
+    A mapped table built with `remap` (a callable returning a fresh mapping) can
+    `release()` its mapping, and with it the file descriptor CPython keeps for it; the
+    text is mapped again on next access.
+    """
+
+    def __init__(self, text: ChunkBuffer, offsets: array, shared: Dict[str, Any],
+                 int_columns: Dict[str, array], coded_columns: Dict[str, Tuple[List[Any], array]],
+                 remap: Optional[Callable[[], Optional[ChunkBuffer]]] = None):
+        self._text: Optional[ChunkBuffer] = text
+        self._remap = remap
+        self.offsets = offsets
+        self.shared = shared
+        self.int_columns = int_columns
+        self.coded_columns = coded_columns
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Document]) -> "ChunkTable":
+        """Build a table from Documents, factoring out metadata shared by all of them."""
+        documents = list(documents)
+        encoded = [doc.page_content.encode('utf-8') for doc in documents]
+        offsets = array('q', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        text = b''.join(encoded)
+
+        keys = list(dict.fromkeys(key for doc in documents for key in doc.metadata))
+        shared: Dict[str, Any] = {}
+        int_columns: Dict[str, array] = {}
+        coded_columns: Dict[str, Tuple[List[Any], array]] = {}
+
+        for key in keys:
+            values = [doc.metadata.get(key, _MISSING) for doc in documents]
+            first = values[0]
+            if first is not _MISSING and all(value == first and type(value) is type(first) for value in values):
+                shared[key] = first
+            elif all(type(value) is int for value in values):
+                int_columns[key] = array('q', values)
+            else:
+                codes: Dict[Any, int] = {}
+                uniques: List[Any] = []
+                column = array('I')
+                for value in values:
+                    # Unhashable values (lists, dicts) are not deduplicated
+                    code_key = (type(value), value) if getattr(value, '__hash__', None) is not None else object()
+                    code = codes.get(code_key)
+                    if code is None:
+                        code = codes[code_key] = len(uniques)
+                        uniques.append(value)
+                    column.append(code)
+                coded_columns[key] = (uniques, column)
+
+        return cls(text, offsets, shared, int_columns, coded_columns)
+
+    @property
+    def text_buffer(self) -> ChunkBuffer:
+        """The UTF-8 text of every chunk, mapped again first if it was released."""
+        text = self._text
+        if text is None or (not isinstance(text, bytes) and text.closed):
+            text = self._remap() if self._remap is not None else None
+            if text is None:
+                raise ValueError("Chunk text was released and can no longer be mapped")
+            self._text = text
+        return text
+
+    def release(self):
+        """Close a remappable text mapping; a no-op for in-memory tables."""
+        text = self._text
+        if self._remap is None or text is None or isinstance(text, bytes):
+            return
+        self._text = None
+        try:
+            text.close()
+        except BufferError:
+            # Views into the mapping are still alive; it is closed when they are collected
+            pass
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Mappings cannot be pickled; ship mapped text as bytes
+        state = dict(self.__dict__)
+        state['_text'] = bytes(self.text_buffer)
+        state['_remap'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def view(self, i: int) -> memoryview:
+        """Zero-copy view of chunk i's UTF-8 bytes."""
+        return memoryview(self.text_buffer)[self.offsets[i]:self.offsets[i + 1]]
+
+    def text(self, i: int) -> str:
+        """Text of chunk i."""
+        return str(self.view(i), 'utf-8')
+
+    def snippet(self, i: int, max_chars: int) -> str:
+        """First max_chars characters of chunk i, decoding only the bytes they can span."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        # A character is at most 4 UTF-8 bytes; a character cut at the edge lies past max_chars
+        data = memoryview(self.text_buffer)[start:min(end, start + 4 * max_chars)]
+        return str(data, 'utf-8', 'ignore')[:max_chars]
+
+    def texts(self) -> Iterator[str]:
+        """Chunk texts in order."""
+        buffer, offsets = memoryview(self.text_buffer), self.offsets
+        for i in range(len(self)):
+            yield str(buffer[offsets[i]:offsets[i + 1]], 'utf-8')
+
+    def column(self, key: str, default: Any = None) -> List[Any]:
+        """All chunks' values for one metadata key."""
+        if key in self.int_columns:
+            return self.int_columns[key].tolist()
+        if key in self.coded_columns:
+            uniques, codes = self.coded_columns[key]
+            return [default if uniques[code] is _MISSING else uniques[code] for code in codes]
+        return [self.shared.get(key, default)] * len(self)
+
+    def get(self, i: int, key: str, default: Any = None) -> Any:
+        """One metadata value of chunk i."""
+        if key in self.int_columns:
+            return self.int_columns[key][i]
+        if key in self.coded_columns:
+            uniques, codes = self.coded_columns[key]
+            value = uniques[codes[i]]
+            return default if value is _MISSING else value
+        return self.shared.get(key, default)
+
+    def metadata(self, i: int) -> Dict[str, Any]:
+        """Full metadata dict of chunk i, shared fields included."""
+        metadata = dict(self.shared)
+        for key, column in self.int_columns.items():
+            metadata[key] = column[i]
+        for key, (uniques, codes) in self.coded_columns.items():
+            value = uniques[codes[i]]
+            if value is not _MISSING:
+                metadata[key] = value
+        return metadata
+
+    def document(self, i: int) -> Document:
+        """Chunk i as a LangChain Document."""
+        return Document(page_content=self.text(i), metadata=self.metadata(i))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.document(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.document(i)
+
+    def __iter__(self) -> Iterator[Document]:
+        for i in range(len(self)):
+            yield self.document(i)
+
+    def to_documents(self) -> List[Document]:
+        """Materialize every chunk as a Document (the LangChain boundary)."""
+        return list(self)
+
+    def with_shared(self, **updates: Any) -> "ChunkTable":
+        """Return a table over the same buffers with some metadata set for every chunk."""
+        int_columns = {k: v for k, v in self.int_columns.items() if k not in updates}
+        coded_columns = {k: v for k, v in self.coded_columns.items() if k not in updates}
+        return ChunkTable(self.text_buffer, self.offsets, {**self.shared, **updates}, int_columns, coded_columns,
+                          self._remap)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form of the table, without the text buffer."""
+        return {
+            'offsets': self.offsets.tolist(),
+            'shared': self.shared,
+            'int_columns': {k: v.tolist() for k, v in self.int_columns.items()},
+            'coded_columns': {
+                k: [[None if u is _MISSING else u for u in uniques], [u is _MISSING for u in uniques], codes.tolist()]
+                for k, (uniques, codes) in self.coded_columns.items()
+            }
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], text: ChunkBuffer,
+                     remap: Optional[Callable[[], Optional[ChunkBuffer]]] = None) -> "ChunkTable":
+        """Rebuild a table from to_payload() output and its text buffer."""
+        return cls(
+            text,
+            array('q', payload['offsets']),
+            payload['shared'],
+            {k: array('q', v) for k, v in payload['int_columns'].items()},
+            {
+                k: ([_MISSING if absent else u for u, absent in zip(uniques, absent_flags)], array('I', codes))
+                for k, (uniques, absent_flags, codes) in payload['coded_columns'].items()
+            },
+            remap
+        )
+
+
+class _Missing:
+    """Marker for a key absent from some chunks' metadata; survives pickling as a singleton."""
+
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self) -> str:
+        return '<missing>'
+
+
+_MISSING = _Missing()
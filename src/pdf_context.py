@@ -0,0 +1,94 @@
+"""Token-budgeted context packing for PDF tool outputs."""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from .pdf_sections import FRONT_MATTER, join_chunks, overlap_length
+
+# Conservative characters-per-token estimate for English prose; errs toward overcounting
+CHARS_PER_TOKEN = 3.5
+
+# Default token budget for packed tool output
+DEFAULT_CONTEXT_TOKENS = 4000
+
+# Separator characters join_chunks may add per chunk, counted against the budget
+_SEPARATOR_SLACK = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a model-specific tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _run_header(doc: Document) -> str:
+    page = doc.metadata.get('page')
+    page_label = f"p. {page + 1}" if isinstance(page, int) else "p. ?"
+    return f"[{doc.metadata.get('section', FRONT_MATTER)}, {page_label}]\n"
+
+
+def pack_chunks(documents: Sequence[Document], candidates: Sequence[int], token_budget: int,
+                max_overlap: int, contiguous: bool = False) -> Tuple[List[int], str]:
+    """Select chunks in candidate (priority) order until the token budget is spent.
+
+    Text a chunk shares with an already selected neighbour is only paid for once, so
+    adjacent hits are cheap to add. Selected chunks are emitted in document order as
+    contiguous runs, each headed by its section and page, with overlaps removed.
+    With contiguous=True packing stops at the first candidate that does not fit
+    (for reading a span in order) instead of trying smaller later candidates.
+    If even the top candidate does not fit, it is truncated to the budget.
+    Returns (selected chunk ids, packed text).
+    """
+    char_budget = token_budget * CHARS_PER_TOKEN
+    overlaps: Dict[int, int] = {}
+
+    def _overlap(chunk_id: int) -> int:
+        if chunk_id not in overlaps:
+            overlaps[chunk_id] = overlap_length(documents[chunk_id - 1], documents[chunk_id], max_overlap) if chunk_id > 0 else 0
+        return overlaps[chunk_id]
+
+    selected = set()
+    used = 0
+    for chunk_id in candidates:
+        if chunk_id in selected:
+            continue
+        joins_previous = chunk_id - 1 in selected
+        joins_next = chunk_id + 1 in selected
+
+        cost = len(documents[chunk_id].page_content) + _SEPARATOR_SLACK
+        if joins_previous:
+            cost -= _overlap(chunk_id)
+        else:
+            cost += len(_run_header(documents[chunk_id]))
+        if joins_next:
+            # The next chunk's repeated prefix and its run header are no longer shown
+            cost -= _overlap(chunk_id + 1) + len(_run_header(documents[chunk_id + 1]))
+
+        if used + cost <= char_budget:
+            selected.add(chunk_id)
+            used += cost
+        elif contiguous:
+            break
+
+    if not selected:
+        if not candidates:
+            return [], ""
+        top = documents[candidates[0]]
+        header = _run_header(top)
+        keep = max(0, int(char_budget) - len(header))
+        return [candidates[0]], header + top.page_content[:keep]
+
+    ordered = sorted(selected)
+    runs: List[List[int]] = []
+    for chunk_id in ordered:
+        if runs and runs[-1][-1] == chunk_id - 1:
+            runs[-1].append(chunk_id)
+        else:
+            runs.append([chunk_id])
+
+    blocks = [
+        _run_header(documents[run[0]]) + join_chunks([documents[i] for i in run], max_overlap)
+        for run in runs
+    ]
+    return ordered, "\n\n".join(blocks)
@@ -0,0 +1,132 @@
+"""Cached index of PDF files under a models directory."""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+class PDFDirectoryIndex:
+    """Deduplicated, sorted PDF listing with prebuilt name lookups.
+
+    The tree is rescanned only when a directory mtime changes (entries added, removed
+    or renamed), checked at most once per `poll_interval` seconds. Hidden files and
+    directories are skipped and symlinked directories are followed, matching glob's
+    behaviour; a directory reached twice (a link loop or two links to one target) is
+    scanned once.
+    """
+
+    def __init__(self, base_dir: str, poll_interval: float = 2.0):
+        self.base_dir = base_dir
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._dir_mtimes: Dict[str, int] = {}
+        self._files: List[str] = []
+        self._by_name: Dict[str, int] = {}
+        self._name_suffixes: List[Tuple[str, int]] = []
+        self._lower_paths: List[str] = []
+
+    def _scan(self):
+        """Walk the tree and rebuild the file list and lookup structures."""
+        dir_mtimes: Dict[str, int] = {}
+        files: List[str] = []
+
+        seen = set()
+        for root, dirs, names in os.walk(self.base_dir, followlinks=True):
+            real_root = os.path.realpath(root)
+            if real_root in seen:
+                dirs[:] = []
+                continue
+            seen.add(real_root)
+            # Sorted so that of several paths to one directory, the same one is scanned every time
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            try:
+                dir_mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            files.extend(
+                os.path.join(root, name) for name in names
+                if name.endswith('.pdf') and not name.startswith('.')
+            )
+
+        files.sort()
+        by_name: Dict[str, int] = {}
+        suffixes: List[Tuple[str, int]] = []
+        for order, path in enumerate(files):
+            name = os.path.basename(path)
+            by_name.setdefault(name, order)
+            lower = name.lower()
+            suffixes.extend((lower[i:], order) for i in range(len(lower)))
+        suffixes.sort()
+
+        self._dir_mtimes = dir_mtimes
+        self._files = files
+        self._by_name = by_name
+        self._name_suffixes = suffixes
+        self._lower_paths = [path.lower() for path in files]
+
+    def _is_stale(self) -> bool:
+        if not self._dir_mtimes:
+            return True
+        for directory, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def refresh(self, force: bool = False):
+        """Rescan if forced, or if the poll interval elapsed and a directory changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < self.poll_interval:
+                return
+            self._last_check = now
+            if force or self._is_stale():
+                self._scan()
+
+    def files(self) -> List[str]:
+        """Return all PDF paths, sorted."""
+        self.refresh()
+        return list(self._files)
+
+    def resolve(self, identifier: Optional[str] = None) -> Optional[str]:
+        """Resolve an identifier to a PDF path.
+
+        Tries an exact filename match, then a case-insensitive filename substring,
+        then a case-insensitive path substring; the first path in sorted order wins.
+        Without an identifier the first PDF is returned.
+        """
+        self.refresh()
+        files = self._files
+        if not files:
+            return None
+        if not identifier:
+            return files[0]
+
+        # Exact filename: O(1)
+        order = self._by_name.get(identifier)
+        if order is not None:
+            return files[order]
+
+        # Filename substring: binary search the sorted suffixes of all filenames
+        needle = identifier.lower()
+        suffixes = self._name_suffixes
+        best = None
+        i = bisect_left(suffixes, (needle, -1))
+        while i < len(suffixes) and suffixes[i][0].startswith(needle):
+            if best is None or suffixes[i][1] < best:
+                best = suffixes[i][1]
+            i += 1
+        if best is not None:
+            return files[best]
+
+        # Path substring over precomputed lowercase paths
+        for order, lower_path in enumerate(self._lower_paths):
+            if needle in lower_path:
+                return files[order]
+
+        return None
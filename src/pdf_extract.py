@@ -0,0 +1,147 @@
+"""Native PyMuPDF text extraction for PDF ingestion."""
+
+import multiprocessing
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pymupdf
+from langchain_core.documents import Document
+
+# Pages at or above this count are extracted on a process pool when page_workers > 1
+PARALLEL_PAGE_THRESHOLD = 64
+
+# Default text flags: keep whitespace and ligatures, clip to the page, join hyphenated line breaks
+DEFAULT_TEXT_FLAGS = (
+    pymupdf.TEXT_PRESERVE_WHITESPACE
+    | pymupdf.TEXT_PRESERVE_LIGATURES
+    | pymupdf.TEXT_MEDIABOX_CLIP
+    | pymupdf.TEXT_DEHYPHENATE
+)
+
+
+# Long-lived worker pools shared by PDF ingestion and page extraction, one per size
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool with max_workers workers, creating it on first use.
+
+    Workers start with forkserver (spawn where it is unavailable) instead of fork: the
+    analyzer runs inside a multithreaded server, and forking a threaded process can
+    deadlock the child.
+    """
+    with _process_pools_lock:
+        pool = _process_pools.get(max_workers)
+        if pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            pool = _process_pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        return pool
+
+
+def discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a broken shared pool so the next get_process_pool call starts a fresh one."""
+    with _process_pools_lock:
+        for size, cached in list(_process_pools.items()):
+            if cached is pool:
+                del _process_pools[size]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def order_blocks(blocks: List[Tuple], page_width: float) -> List[str]:
+    """Order text blocks for reading, handling one- and two-column layouts.
+
+    Blocks that cross the page's vertical midline (titles, full-width figures or
+    abstracts) split the page into bands; within a band the left column is read
+    before the right one.
+    """
+    midline = page_width / 2
+    text_blocks = [b for b in blocks if b[6] == 0 and b[4].strip()]
+    text_blocks.sort(key=lambda b: (b[1], b[0]))
+
+    ordered: List[str] = []
+    left: List[Tuple] = []
+    right: List[Tuple] = []
+
+    def _flush():
+        ordered.extend(b[4] for b in sorted(left, key=lambda b: b[1]))
+        ordered.extend(b[4] for b in sorted(right, key=lambda b: b[1]))
+        left.clear()
+        right.clear()
+
+    for block in text_blocks:
+        x0, x1 = block[0], block[2]
+        if x1 <= midline + 1:
+            left.append(block)
+        elif x0 >= midline - 1:
+            right.append(block)
+        else:
+            _flush()
+            ordered.append(block[4])
+    _flush()
+
+    return ordered
+
+
+def extract_page_text(page, flags: int = DEFAULT_TEXT_FLAGS) -> str:
+    """Extract one page's text with column-aware block ordering."""
+    blocks = page.get_text("blocks", flags=flags, sort=False)
+    return "\n".join(text.rstrip("\n") for text in order_blocks(blocks, page.rect.width))
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int, flags: int) -> List[str]:
+    """Extract a contiguous page range; module-level so it can run in worker processes."""
+    with pymupdf.open(pdf_path) as doc:
+        return [extract_page_text(doc[i], flags) for i in range(start, stop)]
+
+
+def iter_native_pages(pdf_path: str, flags: int = DEFAULT_TEXT_FLAGS,
+                      page_workers: int = 1) -> Tuple[Dict[str, Any], Iterator[Document]]:
+    """Return (document metadata, lazy page stream) using PyMuPDF directly.
+
+    Document-level metadata (title, author, page count...) is returned once instead of
+    being copied into every page; page Documents carry only source, page and total_pages.
+    Long documents are split into page ranges extracted on the shared process pool
+    when page_workers > 1.
+    """
+    doc = pymupdf.open(pdf_path)
+    total_pages = doc.page_count
+    doc_metadata = {k: v for k, v in (doc.metadata or {}).items() if v}
+    doc_metadata['total_pages'] = total_pages
+
+    def _page_doc(page_number: int, text: str) -> Document:
+        return Document(
+            page_content=text,
+            metadata={'source': pdf_path, 'file_path': pdf_path, 'page': page_number, 'total_pages': total_pages}
+        )
+
+    def _sequential() -> Iterator[Document]:
+        try:
+            for page_number in range(total_pages):
+                yield _page_doc(page_number, extract_page_text(doc[page_number], flags))
+        finally:
+            doc.close()
+
+    def _parallel() -> Iterator[Document]:
+        doc.close()
+        step = max(1, -(-total_pages // (page_workers * 4)))
+        ranges = [(start, min(start + step, total_pages)) for start in range(0, total_pages, step)]
+        executor = get_process_pool(page_workers)
+        futures = [executor.submit(_extract_page_range, pdf_path, start, stop, flags) for start, stop in ranges]
+        try:
+            for (start, _), future in zip(ranges, futures):
+                for offset, text in enumerate(future.result()):
+                    yield _page_doc(start + offset, text)
+        except BrokenExecutor:
+            discard_process_pool(executor)
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    if page_workers > 1 and total_pages >= PARALLEL_PAGE_THRESHOLD:
+        return doc_metadata, _parallel()
+    return doc_metadata, _sequential()
+
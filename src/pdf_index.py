@@ -0,0 +1,148 @@
+"""Text indexing helpers for PDF content analysis."""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Content categorization keywords used by PDFAnalyzer.analyze_content
+CONTENT_CATEGORIES: Dict[str, List[str]] = {
+    "architecture": ["architecture", "model", "framework", "structure", "design", "network", "layer"],
+    "methodology": ["method", "approach", "algorithm", "technique", "procedure", "pipeline"],
+    "preprocessing": ["preprocessing", "preprocess", "data preparation", "cleaning", "normalization", "feature"],
+    "hyperparameters": ["hyperparameter", "parameter", "learning rate", "batch size", "epoch", "optimizer"],
+    "dependencies": ["import", "library", "package", "requirement", "dependency", "framework"],
+    "implementation": ["code", "implementation", "function", "class", "module", "script"],
+    "evaluation": ["evaluation", "metrics", "performance", "accuracy", "validation", "testing"],
+    "results": ["results", "findings", "conclusion", "outcome", "performance", "benchmark"]
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Compile words into a prefix-trie regex so matching walks each position once."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def _build(node: Dict[str, dict]) -> str:
+        optional = '' in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            atom = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(atom + _build(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if optional:
+            return '(?:' + body + ')?'
+        return body
+
+    return _build(trie)
+
+
+class KeywordScanner:
+    """Single-pass, case-insensitive multi-keyword matcher with word-boundary semantics.
+
+    All keywords are compiled into one trie-shaped regex, so a text is scanned once
+    regardless of how many keywords or categories there are. Keywords only match whole
+    words (optionally pluralized), so "layer" does not match inside "multilayer".
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = CONTENT_CATEGORIES):
+        self.categories = categories
+        self.keywords = sorted({keyword.lower() for keywords in categories.values() for keyword in keywords})
+        self._pattern = re.compile(
+            r'\b(' + _trie_pattern(self.keywords) + r')(?:e?s)?\b',
+            re.IGNORECASE
+        )
+
+    def count(self, text: str) -> Counter:
+        """Count keyword occurrences in a text."""
+        return Counter(' '.join(match.lower().split()) for match in self._pattern.findall(text))
+
+    def category_scores(self, keyword_counts: Counter) -> Dict[str, int]:
+        """Sum keyword counts into per-category scores."""
+        return {
+            category: sum(keyword_counts[keyword] for keyword in keywords)
+            for category, keywords in self.categories.items()
+        }
+
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this "
+    "to was were what which with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms, dropping common stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class ChunkIndex:
+    """Per-document inverted index over chunk texts with BM25 ranking.
+
+    A None text keeps its chunk id but leaves the chunk out of the index (e.g. references).
+    """
+
+    def __init__(self, texts: Iterable[Optional[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: List[int] = []
+
+        self.num_chunks = 0
+        for chunk_id, text in enumerate(texts):
+            if text is None:
+                self.doc_lengths.append(0)
+                continue
+            terms = tokenize(text)
+            self.doc_lengths.append(len(terms))
+            self.num_chunks += 1
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, {})[chunk_id] = tf
+
+        self.avg_length = sum(self.doc_lengths) / self.num_chunks if self.num_chunks else 0.0
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency of a term."""
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (self.num_chunks - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return (chunk_id, score) pairs ranked by BM25 for a multi-term query."""
+        return self.search_many([query], top_k)[0]
+
+    def search_many(self, queries: List[str], top_k: Optional[int] = None) -> List[List[Tuple[int, float]]]:
+        """Rank chunks for several queries at once, one ranking per query.
+
+        Each distinct term's postings are walked once and its BM25 contribution is
+        added to every query containing it, so overlapping queries share the work.
+        """
+        term_queries: Dict[str, List[int]] = {}
+        for query_id, query in enumerate(queries):
+            for term in set(tokenize(query)):
+                term_queries.setdefault(term, []).append(query_id)
+
+        scores: List[Dict[int, float]] = [{} for _ in queries]
+        for term, query_ids in term_queries.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for chunk_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[chunk_id] / self.avg_length)
+                contribution = idf * tf * (self.k1 + 1) / (tf + norm)
+                for query_id in query_ids:
+                    scores[query_id][chunk_id] = scores[query_id].get(chunk_id, 0.0) + contribution
+
+        rankings = []
+        for query_scores in scores:
+            ranked = sorted(query_scores.items(), key=lambda item: (-item[1], item[0]))
+            rankings.append(ranked[:top_k] if top_k is not None else ranked)
+        return rankings
@@ -0,0 +1,234 @@
+"""Section detection for research-paper PDFs."""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Canonical section -> heading titles that open it (matched case-insensitively, whole line)
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "abstract": ["abstract", "summary"],
+    "introduction": ["introduction", "background", "motivation"],
+    "related_work": ["related work", "related works", "literature review", "prior work"],
+    "methods": ["methods", "method", "methodology", "materials and methods", "approach",
+                "proposed method", "model", "model architecture", "architecture", "framework"],
+    "data": ["data", "dataset", "datasets", "data collection", "data sources", "materials"],
+    "preprocessing": ["preprocessing", "data preprocessing", "data preparation", "feature engineering"],
+    "experiments": ["experiments", "experimental setup", "experimental settings", "implementation details",
+                    "implementation", "training", "training details", "hyperparameters", "evaluation"],
+    "results": ["results", "results and discussion", "findings"],
+    "discussion": ["discussion", "limitations"],
+    "conclusion": ["conclusion", "conclusions", "conclusion and future work", "conclusions and future work"],
+    "acknowledgements": ["acknowledgements", "acknowledgments", "acknowledgement", "acknowledgment"],
+    "references": ["references", "bibliography", "works cited", "literature cited"],
+    "appendix": ["appendix", "appendices", "supplementary material", "supplementary materials",
+                 "supplementary information"]
+}
+
+# Section assigned to text before the first recognized heading (title, authors, affiliations)
+FRONT_MATTER = "front_matter"
+
+# Sections kept out of the BM25 index and the vector index
+UNINDEXED_SECTIONS = frozenset({"references"})
+
+# Shortest repeated prefix join_chunks treats as overlap between adjacent chunks
+MIN_OVERLAP = 16
+
+# A bare (unnumbered, mixed-case) title line counts as a heading only when isolated:
+# the line before it is blank, short or ends a sentence (not a wrapped paragraph line),
+# and the line after is blank, another heading, or prose at least this long. Table
+# headers and words wrapped onto their own line fail this.
+MIN_PROSE_LINE = 40
+
+# Share of a page's lines that must look like reference entries for the references
+# section to continue onto it
+BIBLIOGRAPHY_LINE_RATIO = 0.3
+
+_TITLE_TO_SECTION = {
+    title: section for section, titles in SECTION_HEADINGS.items() for title in titles
+}
+
+_NUMBERING = r'(?:\d+(?:\.\d+)*|[IVX]+|[A-H])\.?'
+
+# Optional numbering ("3", "3.1", "III.", "A."), then a known title, optionally ending in ':' or '.'
+_HEADING_PATTERN = re.compile(
+    r'^(?:(' + _NUMBERING + r')\s+)?'
+    r'(' + '|'.join(sorted((re.escape(t).replace(r'\ ', r'\s+') for t in _TITLE_TO_SECTION), key=len, reverse=True)) + r')'
+    r'\s*([:.]?)$',
+    re.IGNORECASE
+)
+
+# "Appendix", "Appendix A", "Appendix B.2: Hyperparameters", "Supplementary Methods",
+# "Supplementary Note 3 - Training details"
+_APPENDIX_PATTERN = re.compile(
+    r'^(?:' + _NUMBERING + r'\s+)?'
+    r'(?:Appendix|APPENDIX|Appendices|APPENDICES|(?:Supplementary|SUPPLEMENTARY)\s+'
+    r'(?i:materials?|information|methods|notes?|text|data|figures|tables|sections?|experiments|results))'
+    r'(?:\s+(?:[A-Z]|\d+)(?:\.\d+)*)?'
+    r'(?:\s*[:.\u2013\u2014-]\s*\S.*|\s+[A-Z](?:[a-z]|[A-Z]{2})\S*(?:\s+\S+)*|\s*[:.]?)$'
+)
+
+_SENTENCE_END = ('.', '!', '?', ':', ';', ')', ']', '"')
+
+_REFERENCE_LINE = re.compile(
+    r'^\s*(?:\[\d+\]|\d{1,3}\.\s)|\b(?:19|20)\d{2}[a-z]?\b|\bdoi\b|arxiv|\bet al\b|\bpp\.|\bvol\.',
+    re.IGNORECASE
+)
+
+
+def detect_heading(line: str, previous: Optional[str] = None, following: Optional[str] = None) -> Optional[str]:
+    """Return the canonical section a heading line opens, or None for body text.
+
+    Numbered ("3.1 Data"), all-caps ("METHODS"), appendix and supplementary headings
+    are recognized on their own. A bare title such as "Method" also needs its
+    neighbouring lines, `previous` and `following` ("" for a blank line or a page
+    edge), to show it standing alone; without them it is treated as body text.
+    """
+    line = line.strip()
+    if not line or len(line) > 80:
+        return None
+    if _APPENDIX_PATTERN.match(line):
+        return "appendix"
+    match = _HEADING_PATTERN.match(line)
+    if match is None:
+        return None
+    section = _TITLE_TO_SECTION[' '.join(match.group(2).lower().split())]
+    if match.group(1) or line.isupper():
+        return section
+
+    # Bare title: capitalized, no trailing period, and isolated from the text around it
+    if not line[0].isupper() or match.group(3) == '.' or previous is None or following is None:
+        return None
+    previous, following = previous.strip(), following.strip()
+    if len(previous) >= MIN_PROSE_LINE and not previous.endswith(_SENTENCE_END):
+        return None
+    if following and len(following) < MIN_PROSE_LINE and detect_heading(following) is None:
+        return None
+    return section
+
+
+def find_headings(text: str) -> List[Tuple[int, str]]:
+    """Return (offset of the heading line, section) for each heading in page text."""
+    lines = text.splitlines(keepends=True)
+    headings: List[Tuple[int, str]] = []
+    offset = 0
+    for i, line in enumerate(lines):
+        previous = lines[i - 1] if i else ""
+        following = lines[i + 1] if i + 1 < len(lines) else ""
+        section = detect_heading(line, previous, following)
+        if section is not None:
+            headings.append((offset, section))
+        offset += len(line)
+    return headings
+
+
+def split_at_headings(text: str) -> List[str]:
+    """Split page text into segments that each start at a heading line.
+
+    Text before the first heading on the page forms the first segment, so chunks
+    split from each segment never straddle a section boundary.
+    """
+    bounds = [offset for offset, _ in find_headings(text) if offset] + [len(text)]
+    segments = [text[start:end] for start, end in zip([0] + bounds[:-1], bounds)]
+    return [segment for segment in segments if segment.strip()]
+
+
+def looks_like_bibliography(text: str) -> bool:
+    """Whether enough lines look like reference entries (numbered, dated, DOI, et al.)."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return False
+    return sum(1 for line in lines if _REFERENCE_LINE.search(line)) >= BIBLIOGRAPHY_LINE_RATIO * len(lines)
+
+
+def carry_section(current: str, page_text: str) -> str:
+    """Section a page starts in, given the section the previous page ended in.
+
+    References do not carry onto a page whose leading text is not a bibliography:
+    appendices and supplements often follow them without a recognized heading.
+    """
+    if current != "references":
+        return current
+    headings = find_headings(page_text)
+    lead = page_text[:headings[0][0]] if headings else page_text
+    if lead.strip() and not looks_like_bibliography(lead):
+        return "appendix"
+    return current
+
+
+def page_chunk_sections(page_text: str, chunk_texts: Iterable[str], current: str) -> List[str]:
+    """Section of each chunk split from a page, in order.
+
+    A chunk belongs to the last heading at or before where it starts in the page
+    text, else to `current`, the section the page starts in.
+    """
+    headings = find_headings(page_text)
+    sections: List[str] = []
+    position, next_heading = 0, 0
+    for text in chunk_texts:
+        start = page_text.find(text, position)
+        if start >= 0:
+            while next_heading < len(headings) and headings[next_heading][0] <= start:
+                current = headings[next_heading][1]
+                next_heading += 1
+            position = start + 1
+        sections.append(current)
+    return sections
+
+
+def build_section_index(chunk_sections: Iterable[Optional[str]]) -> Dict[str, List[int]]:
+    """Map section -> chunk indices in document order, given each chunk's section."""
+    sections: Dict[str, List[int]] = {}
+    for chunk_id, section in enumerate(chunk_sections):
+        sections.setdefault(section or FRONT_MATTER, []).append(chunk_id)
+    return sections
+
+
+def resolve_section(name: str) -> Optional[str]:
+    """Map a user-supplied section name or heading title to its canonical section."""
+    key = ' '.join(name.lower().replace('_', ' ').split())
+    if key.replace(' ', '_') in SECTION_HEADINGS or key.replace(' ', '_') == FRONT_MATTER:
+        return key.replace(' ', '_')
+    return _TITLE_TO_SECTION.get(key)
+
+
+def overlap_length(previous: Document, doc: Document, max_overlap: int) -> int:
+    """Length of the prefix of `doc` the splitter repeated from the end of `previous`.
+
+    Only consecutive chunks from the same page can overlap.
+    """
+    if (doc.metadata.get('page') != previous.metadata.get('page')
+            or doc.metadata.get('chunk_index') != previous.metadata.get('chunk_index', -2) + 1):
+        return 0
+    prev_text, text = previous.page_content, doc.page_content
+    # Very short matches are coincidental (e.g. at a heading cut), not splitter overlap
+    for size in range(min(max_overlap, len(prev_text), len(text)), MIN_OVERLAP - 1, -1):
+        if prev_text.endswith(text[:size]):
+            return size
+    return 0
+
+
+def join_chunks(documents: List[Document], max_overlap: int) -> str:
+    """Concatenate chunks in order, dropping the overlap the splitter repeated between neighbours.
+
+    Chunks that do not overlap their predecessor start on a new line, or after a blank
+    line when they come from a different page or are not adjacent.
+    """
+    parts: List[str] = []
+    previous: Optional[Document] = None
+    for doc in documents:
+        text = doc.page_content
+        if previous is None:
+            parts.append(text)
+        else:
+            size = overlap_length(previous, doc, max_overlap)
+            if size:
+                text = text[size:]
+                parts.append(text if text[:1].isspace() else ' ' + text)
+            elif (doc.metadata.get('page') == previous.metadata.get('page')
+                    and doc.metadata.get('chunk_index') == previous.metadata.get('chunk_index', -2) + 1):
+                parts.append('\n' + text)
+            else:
+                parts.append('\n\n' + text)
+        previous = doc
+    return ''.join(parts)
@@ -0,0 +1,184 @@
+"""Persistent on-disk store for processed PDF chunks."""
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+from functools import partial
+from typing import Any, Dict, Optional
+
+from .cache import DEFAULT_CACHE_DIR
+from .pdf_chunks import ChunkBuffer, ChunkTable
+from .pdf_sections import SECTION_HEADINGS
+
+# Bump when the stored payload layout changes
+STORE_SCHEMA_VERSION = 6
+
+
+def compute_store_version(splitter_config: Dict[str, Any], extraction_backend: str = "loader") -> str:
+    """Derive a store version from the schema version, splitter settings, extraction backend and section headings."""
+    payload = json.dumps(
+        {'schema': STORE_SCHEMA_VERSION, 'splitter': splitter_config, 'backend': extraction_backend,
+         'sections': SECTION_HEADINGS},
+        sort_keys=True
+    )
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+class PDFChunkStore:
+    """SQLite-backed store of ingested PDFs, shared across restarts and workers.
+
+    Entries are addressed by the analyzer's content fingerprint and tagged with a
+    version string, so changing the splitter settings or extraction backend
+    invalidates old entries.
+
+    Chunk metadata and offsets live in SQLite; each entry's chunk text is one UTF-8
+    file under `chunk_text/`, memory-mapped read-only on load so every process using
+    the store shares the page cache instead of holding its own copy. Loaded tables can
+    release their mapping and map the file again on demand.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, version: str = ""):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.db_path = os.path.join(cache_dir, "pdf_chunks.sqlite3")
+        self.text_dir = os.path.join(cache_dir, "chunk_text")
+        self._lock = threading.Lock()
+
+        os.makedirs(self.text_dir, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingested_pdfs ("
+                " cache_key TEXT PRIMARY KEY,"
+                " version TEXT NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " documents TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_fingerprints ("
+                " stat_key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " path TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL)"
+            )
+            # Drop entries written with other splitter settings or schema versions
+            self._conn.execute("DELETE FROM ingested_pdfs WHERE version != ?", (version,))
+        for name in os.listdir(self.text_dir):
+            if not name.endswith(f".{version}.utf8"):
+                self._remove_file(os.path.join(self.text_dir, name))
+
+    def _text_path(self, cache_key: str) -> str:
+        return os.path.join(self.text_dir, f"{cache_key}.{self.version}.utf8")
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _map_text(self, cache_key: str) -> Optional[ChunkBuffer]:
+        """Map an entry's chunk text read-only; None if the file is missing."""
+        try:
+            with open(self._text_path(cache_key), 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored metadata and documents for a cache key, if present."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata, documents FROM ingested_pdfs WHERE cache_key = ? AND version = ?",
+                (cache_key, self.version)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        text = self._map_text(cache_key)
+        if text is None:
+            return None
+        documents = ChunkTable.from_payload(json.loads(row[1]), text, partial(self._map_text, cache_key))
+        return {'metadata': json.loads(row[0]), 'documents': documents}
+
+    def put(self, cache_key: str, metadata: Dict[str, Any], documents: ChunkTable) -> Optional[ChunkTable]:
+        """Persist the metadata and chunk table for a cache key.
+
+        Returns the same table backed by the stored, memory-mapped text.
+        """
+        payload = json.dumps(documents.to_payload())
+        path = self._text_path(cache_key)
+        # Write-then-rename so concurrent readers never map a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(documents.text_buffer)
+        os.replace(tmp_path, path)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested_pdfs (cache_key, version, metadata, documents) VALUES (?, ?, ?, ?)",
+                (cache_key, self.version, json.dumps(metadata), payload)
+            )
+
+        text = self._map_text(cache_key)
+        if text is None:
+            return None
+        return ChunkTable.from_payload(json.loads(payload), text, partial(self._map_text, cache_key))
+
+    def get_fingerprint(self, stat_key: str) -> Optional[str]:
+        """Return the content fingerprint memoized for a file stat signature."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM file_fingerprints WHERE stat_key = ?", (stat_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_fingerprint(self, stat_key: str, fingerprint: str):
+        """Memoize the content fingerprint for a file stat signature."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_fingerprints (stat_key, fingerprint) VALUES (?, ?)",
+                (stat_key, fingerprint)
+            )
+
+    def get_source(self, path: str) -> Optional[str]:
+        """Return the fingerprint last ingested for a path."""
+        with self._lock:
+            row = self._conn.execute("SELECT fingerprint FROM sources WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def put_source(self, path: str, fingerprint: str):
+        """Record the fingerprint most recently ingested for a path."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (path, fingerprint) VALUES (?, ?)", (path, fingerprint)
+            )
+
+    def delete(self, cache_key: str):
+        """Remove a single entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ingested_pdfs WHERE cache_key = ?", (cache_key,))
+        self._remove_file(self._text_path(cache_key))
+
+    def clear(self):
+        """Remove all stored entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ingested_pdfs")
+            self._conn.execute("DELETE FROM file_fingerprints")
+            self._conn.execute("DELETE FROM sources")
+        for name in os.listdir(self.text_dir):
+            self._remove_file(os.path.join(self.text_dir, name))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ingested_pdfs").fetchone()[0]
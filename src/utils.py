@@ -1,21 +1,58 @@
 import os
-import glob
 import hashlib
+import heapq
 import threading
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from itertools import groupby
+import asyncio
+from concurrent.futures import BrokenExecutor, Future, ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
-from langchain_core.tools import tool
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+from langchain_core.tools import tool, BaseTool, StructuredTool
 from datetime import datetime
+from .pdf_store import PDFChunkStore, compute_store_version
+from .pdf_chunks import ChunkTable
+from .pdf_index import KeywordScanner, ChunkIndex
+from .embeddings import get_embeddings
+from .cache import BoundedCache, DEFAULT_CACHE_DIR
+from .pdf_directory import PDFDirectoryIndex
+from .pdf_extract import discard_process_pool, get_process_pool, iter_native_pages
+from .pdf_context import DEFAULT_CONTEXT_TOKENS, estimate_tokens, pack_chunks
+from .pdf_sections import (
+    FRONT_MATTER, UNINDEXED_SECTIONS, split_at_headings, carry_section, page_chunk_sections,
+    build_section_index, resolve_section
+)
+
+
+# PDF text extraction backend: "loader" (PyMuPDFLoader) or "native" (direct PyMuPDF)
+DEFAULT_PDF_BACKEND = os.getenv('AUTODRP_PDF_BACKEND', 'loader')
+
+
+# Default in-memory cache limits (None disables a limit); override per analyzer with cache_limits
+DEFAULT_CACHE_LIMITS: Dict[str, Dict[str, Any]] = {
+    # Each store-backed entry holds a mapping and its file descriptor; the entry cap keeps
+    # descriptors well under the usual 1024 limit
+    'documents': {'max_entries': 128, 'max_bytes': 512 * 1024 * 1024, 'ttl': None},
+    'index': {'max_entries': None, 'max_bytes': 256 * 1024 * 1024, 'ttl': None},
+    'analysis': {'max_entries': 256, 'max_bytes': 64 * 1024 * 1024, 'ttl': 3600},
+    # Per-file query bucket inside the analysis cache; each query expires on its own
+    'analysis_queries': {'max_entries': 64, 'max_bytes': 16 * 1024 * 1024, 'ttl': 3600}
+}
 
 
 class GlobalStateManager:
     """Simplified thread-safe state manager for AutoDRP agents."""
     
-    _lock = threading.Lock()
+    # Reentrant: get_state and update_state call initialize while holding the lock
+    _lock = threading.RLock()
     _state = None
     
     @classmethod
@@ -76,20 +113,259 @@ class GlobalStateManager:
         return "\n".join(info)
 
 
+def build_pdf_metadata(pdf_path: str) -> Dict[str, Any]:
+    """Build basic file metadata; page fields are filled in while streaming pages."""
+    return {
+        'file_path': pdf_path,
+        'file_size': os.path.getsize(pdf_path),
+        'num_pages': 0,
+        'extraction_time': datetime.now().isoformat()
+    }
+
+
+def page_hash(text: str) -> str:
+    """Content hash of a single page's extracted text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def stream_pdf(pdf_path: str, splitter_config: Dict[str, Any], metadata: Dict[str, Any],
+               reuse_pages: Optional[Dict[str, List[str]]] = None,
+               backend: str = "loader", page_workers: int = 1) -> Iterator[Document]:
+    """Lazily load a PDF page by page and yield split chunks as they are produced.
+    
+    Only one page is held by the loader at a time. `metadata` is updated in place
+    with the page count and first-page preview as pages are read. Pages whose content
+    hash appears in `reuse_pages` (page hash -> chunk texts from a previous revision)
+    keep those chunks instead of being re-split.
+    
+    `backend` selects PyMuPDFLoader ("loader") or direct PyMuPDF extraction with
+    column-aware ordering ("native"); the native backend extracts long documents on
+    `page_workers` processes.
+    
+    Pages are cut at section headings before splitting, so no chunk straddles two
+    sections; each chunk is tagged with its section, carried across page breaks
+    (references stop at a page that is not a bibliography).
+    """
+    metadata.update(build_pdf_metadata(pdf_path))
+    metadata['reused_pages'] = 0
+    text_splitter = RecursiveCharacterTextSplitter(**splitter_config)
+    chunk_index = 0
+    section = FRONT_MATTER
+    
+    if backend == "native":
+        metadata['pdf_metadata'], pages = iter_native_pages(pdf_path, page_workers=page_workers)
+    elif backend == "loader":
+        pages = PyMuPDFLoader(pdf_path).lazy_load()
+    else:
+        raise ValueError(f"Unknown PDF extraction backend: {backend}")
+    
+    for page in pages:
+        if metadata['num_pages'] == 0:
+            metadata['preview'] = page.page_content[:300].replace('\n', ' ').strip()
+        metadata['num_pages'] += 1
+        
+        current_hash = page_hash(page.page_content)
+        if reuse_pages and current_hash in reuse_pages:
+            metadata['reused_pages'] += 1
+            page_chunks = [
+                Document(page_content=text, metadata=dict(page.metadata))
+                for text in reuse_pages[current_hash]
+            ]
+        else:
+            page_chunks = text_splitter.split_documents([
+                Document(page_content=segment, metadata=page.metadata)
+                for segment in split_at_headings(page.page_content)
+            ])
+        
+        section = carry_section(section, page.page_content)
+        sections = page_chunk_sections(page.page_content, (doc.page_content for doc in page_chunks), section)
+        for doc, section in zip(page_chunks, sections):
+            doc.metadata.update({
+                'source_file': pdf_path,
+                'chunk_index': chunk_index,
+                'page_hash': current_hash,
+                'section': section
+            })
+            chunk_index += 1
+            yield doc
+
+
+def parse_pdf(pdf_path: str, splitter_config: Dict[str, Any],
+              reuse_pages: Optional[Dict[str, List[str]]] = None,
+              backend: str = "loader", page_workers: int = 1) -> Dict[str, Any]:
+    """Parse a PDF in a single PyMuPDF pass into metadata and a compact chunk table.
+    
+    Module-level so it can run in worker processes.
+    """
+    metadata: Dict[str, Any] = {}
+    processed_docs = list(stream_pdf(pdf_path, splitter_config, metadata, reuse_pages, backend, page_workers))
+    
+    for doc in processed_docs:
+        doc.metadata['total_chunks'] = len(processed_docs)
+    
+    return {'metadata': metadata, 'documents': ChunkTable.from_documents(processed_docs)}
+
+
+class UniqueChunkRetriever(BaseRetriever):
+    """Vector store retriever that returns each distinct chunk text once.
+    
+    Copies of a paper under different paths are indexed per file, so their chunks
+    come back as equal-scoring neighbours; `fetch_k` candidates are searched and
+    repeats dropped to fill `k` results.
+    """
+    
+    vectorstore: VectorStore
+    k: int = 8
+    fetch_k: int = 32
+    
+    def _unique(self, documents: List[Document]) -> List[Document]:
+        seen = set()
+        unique: List[Document] = []
+        for doc in documents:
+            if doc.page_content in seen:
+                continue
+            seen.add(doc.page_content)
+            unique.append(doc)
+            if len(unique) == self.k:
+                break
+        return unique
+    
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self._unique(self.vectorstore.similarity_search(query, k=max(self.k, self.fetch_k)))
+    
+    async def _aget_relevant_documents(self, query: str, *,
+                                       run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        return self._unique(await self.vectorstore.asimilarity_search(query, k=max(self.k, self.fetch_k)))
+
+
 class PDFAnalyzer:
     """Comprehensive PDF analysis and processing class."""
     
-    def __init__(self, base_dir: str = "./models"):
+    def __init__(self, base_dir: str = "./models", cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 embedding_provider: Optional[str] = None,
+                 cache_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 extraction_backend: str = DEFAULT_PDF_BACKEND):
         self.base_dir = base_dir
-        self.embeddings = OpenAIEmbeddings()
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ".", " ", ""]
-        )
-        # Caching for analysis results
-        self._analysis_cache: Dict[str, Dict[str, Any]] = {}
-        self._documents_cache: Dict[str, List[Document]] = {}
+        self.cache_dir = cache_dir
+        # Embeddings are only built when a retriever is first needed
+        self.embedding_provider = embedding_provider
+        self._embeddings: Optional[Embeddings] = None
+        self.splitter_config = {
+            'chunk_size': 1000,
+            'chunk_overlap': 200,
+            'separators': ["\n\n", "\n", ".", " ", ""]
+        }
+        self.text_splitter = RecursiveCharacterTextSplitter(**self.splitter_config)
+        self.extraction_backend = extraction_backend
+        # Per-page parallelism for single long documents (native backend only)
+        self.page_workers = os.cpu_count() or 1
+        self.keyword_scanner = KeywordScanner()
+        self.query_top_k = 10
+        # Sections left out of BM25 ranking and embedding
+        self.unindexed_sections = UNINDEXED_SECTIONS
+        # Bounded caching for analysis results; metadata and indexes follow their documents out.
+        # The analysis cache is two-level: file fingerprint -> bounded {query hash -> result}
+        limits = {name: {**defaults, **(cache_limits or {}).get(name, {})} for name, defaults in DEFAULT_CACHE_LIMITS.items()}
+        self._analysis_cache = BoundedCache(**limits['analysis'])
+        self._query_limits = limits['analysis_queries']
+        self._documents_cache = BoundedCache(**limits['documents'], on_evict=self._on_documents_evicted)
+        self._index_cache = BoundedCache(**limits['index'])
+        self._metadata_cache: Dict[str, Dict[str, Any]] = {}
+        self._section_cache: Dict[str, Dict[str, List[int]]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        # Current fingerprint of each path, and the paths that share each fingerprint
+        self._path_fingerprints: Dict[str, str] = {}
+        self._fingerprint_paths: Dict[str, set] = {}
+        # Fingerprint each path had before its latest change, for page-level re-chunking
+        self._previous_fingerprints: Dict[str, str] = {}
+        self._fingerprint_lock = threading.Lock()
+        
+        # Shared vector stores and retrievers per corpus
+        self._vectorstores: Dict[str, Chroma] = {}
+        self._retrievers: Dict[str, Any] = {}
+        self._vector_lock = threading.Lock()
+        
+        # In-flight parses/analyses shared by concurrent identical requests
+        self._inflight: Dict[Tuple[str, ...], Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Cached models-directory listings, refreshed when directory mtimes change
+        self._directory_indexes: Dict[str, PDFDirectoryIndex] = {}
+        self._directory_lock = threading.Lock()
+        
+        # Persistent chunk store shared across restarts (disabled with cache_dir=None)
+        self.store: Optional[PDFChunkStore] = None
+        if cache_dir:
+            try:
+                self.store = PDFChunkStore(cache_dir, compute_store_version(self.splitter_config, extraction_backend))
+            except Exception as e:
+                print(f"[WARNING] Persistent PDF store unavailable: {str(e)}")
+    
+    def _on_documents_evicted(self, cache_key: str, documents: ChunkTable):
+        """Drop metadata and index entries that belong to evicted documents, and unmap their text."""
+        self._metadata_cache.pop(cache_key, None)
+        self._section_cache.pop(cache_key, None)
+        self._index_cache.pop(cache_key, None)
+        documents.release()
+    
+    def _claim_inflight(self, key: Tuple[str, ...]) -> Tuple[Future, bool]:
+        """Return the future for an in-flight request and whether the caller owns it."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+    
+    def _release_inflight(self, key: Tuple[str, ...], future: Future, result: Any):
+        """Publish an owned request's result (None on failure) to any waiters."""
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+    
+    def _run_coalesced(self, key: Tuple[str, ...], fn, *args) -> Any:
+        """Run fn once for concurrent identical requests; waiters share the owner's result.
+        
+        If the owner fails, each waiter runs fn itself so errors surface per caller.
+        """
+        future, owner = self._claim_inflight(key)
+        if not owner:
+            result = future.result()
+            return result if result is not None else fn(*args)
+        
+        result = None
+        try:
+            result = fn(*args)
+            return result
+        finally:
+            self._release_inflight(key, future, result)
+    
+    async def run_in_executor(self, fn, *args, **kwargs) -> Any:
+        """Run blocking PDF work off the event loop on the analyzer's thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="pdf")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+    
+    @property
+    def embeddings(self) -> Embeddings:
+        """Cached embedder for the configured provider, created on first use."""
+        if self._embeddings is None:
+            self._embeddings = get_embeddings(self.embedding_provider, self.cache_dir)
+        return self._embeddings
+    
+    @embeddings.setter
+    def embeddings(self, embeddings: Embeddings):
+        self._embeddings = embeddings
+    
+    def _get_directory_index(self, search_dir: str) -> PDFDirectoryIndex:
+        """Return the cached directory index for a search directory."""
+        with self._directory_lock:
+            if search_dir not in self._directory_indexes:
+                self._directory_indexes[search_dir] = PDFDirectoryIndex(search_dir)
+            return self._directory_indexes[search_dir]
     
     def find_pdf_files(self, base_dir: Optional[str] = None) -> List[str]:
         """Find all PDF files in the specified directory and subdirectories."""
@@ -97,38 +373,18 @@ class PDFAnalyzer:
         if not os.path.exists(search_dir):
             return []
         
-        pdf_files = []
-        for pattern in [f"{search_dir}/**/*.pdf", f"{search_dir}/*.pdf"]:
-            pdf_files.extend(glob.glob(pattern, recursive=True))
-        
-        return sorted(pdf_files)
+        return self._get_directory_index(search_dir).files()
     
     def auto_find_pdf(self, pdf_identifier: Optional[str] = None, base_dir: Optional[str] = None) -> Optional[str]:
-        """Automatically find a PDF file based on identifier or return the first available PDF."""
-        pdf_files = self.find_pdf_files(base_dir)
+        """Automatically find a PDF file based on identifier or return the first available PDF.
         
-        if not pdf_files:
+        Tries an exact filename, then a partial filename, then a path match.
+        """
+        search_dir = base_dir or self.base_dir
+        if not os.path.exists(search_dir):
             return None
         
-        if not pdf_identifier:
-            return pdf_files[0]
-        
-        # Try exact filename match first
-        for pdf_path in pdf_files:
-            if os.path.basename(pdf_path) == pdf_identifier:
-                return pdf_path
-        
-        # Try partial filename match
-        for pdf_path in pdf_files:
-            if pdf_identifier.lower() in os.path.basename(pdf_path).lower():
-                return pdf_path
-        
-        # Try path match
-        for pdf_path in pdf_files:
-            if pdf_identifier.lower() in pdf_path.lower():
-                return pdf_path
-        
-        return None
+        return self._get_directory_index(search_dir).resolve(pdf_identifier)
     
     def _resolve_pdf_path(self, pdf_path: Optional[str] = None) -> Optional[str]:
         """Resolve PDF path with fallback logic and validation."""
@@ -147,72 +403,353 @@ class PDFAnalyzer:
         return self.auto_find_pdf(os.path.basename(pdf_path))
     
     def _get_file_cache_key(self, pdf_path: str) -> str:
-        """Generate cache key based on file path and modification time."""
+        """Generate cache key from a content fingerprint of the file.
+        
+        Identical bytes share one key regardless of path or mtime. The fingerprint is
+        memoized by (device, inode, size, mtime), so lookups on unchanged files never
+        re-read the file.
+        """
         try:
-            mtime = os.path.getmtime(pdf_path)
-            # Use file path and modification time for cache key
-            return hashlib.md5(f"{pdf_path}_{mtime}".encode()).hexdigest()
+            st = os.stat(pdf_path)
         except OSError:
             # If file doesn't exist, return path-only hash
             return hashlib.md5(pdf_path.encode()).hexdigest()
+        
+        stat_key = f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+        fingerprint = self._fingerprints.get(stat_key)
+        if fingerprint is None and self.store is not None:
+            fingerprint = self.store.get_fingerprint(stat_key)
+        
+        if fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(pdf_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            fingerprint = digest.hexdigest()
+            if self.store is not None:
+                try:
+                    self.store.put_fingerprint(stat_key, fingerprint)
+                except Exception as e:
+                    print(f"[WARNING] Failed to persist file fingerprint: {str(e)}")
+        
+        self._fingerprints[stat_key] = fingerprint
+        self._track_path_fingerprint(pdf_path, fingerprint)
+        return fingerprint
+    
+    def _track_path_fingerprint(self, pdf_path: str, fingerprint: str):
+        """Record a path's fingerprint and drop cached analyses of content it no longer has."""
+        path = os.path.abspath(pdf_path)
+        with self._fingerprint_lock:
+            previous = self._path_fingerprints.get(path)
+            if previous == fingerprint:
+                return
+            
+            self._path_fingerprints[path] = fingerprint
+            self._fingerprint_paths.setdefault(fingerprint, set()).add(path)
+            if previous is None:
+                return
+            
+            self._previous_fingerprints[path] = previous
+            previous_paths = self._fingerprint_paths.get(previous, set())
+            previous_paths.discard(path)
+            if not previous_paths:
+                # No path holds the old content any more: drop all its analyses at once
+                self._fingerprint_paths.pop(previous, None)
+                self._analysis_cache.pop(previous)
+    
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.md5(query.encode()).hexdigest()
+    
+    def _get_cached_analysis(self, cache_key: str, query: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached analysis in the file's query bucket."""
+        bucket = self._analysis_cache.get(cache_key, record_stats=False)
+        result = None
+        if bucket is not None:
+            resident = bucket.resident_bytes
+            result = bucket.get(self._query_hash(query), record_stats=False)
+            if bucket.resident_bytes != resident:
+                # The query expired and was dropped from the bucket
+                self._analysis_cache.adjust(cache_key, bucket.resident_bytes - resident)
+        self._analysis_cache.record_lookup(result is not None)
+        return result
+    
+    def _store_analysis(self, cache_key: str, query: str, result: Dict[str, Any]):
+        """Add an analysis to the file's query bucket and account for its size.
+        
+        Buckets are LRU caches themselves, so a single heavily queried file cannot
+        grow without bound once it is the only entry left in the analysis cache.
+        """
+        bucket = self._analysis_cache.get(cache_key, record_stats=False)
+        if bucket is None:
+            bucket = BoundedCache(**self._query_limits)
+            self._analysis_cache[cache_key] = bucket
+        
+        resident = bucket.resident_bytes
+        bucket[self._query_hash(query)] = result
+        self._analysis_cache.adjust(cache_key, bucket.resident_bytes - resident)
+    
+    def has_cached_analysis(self, pdf_path: str, query: str = "") -> bool:
+        """Check whether an analysis for this file content and query is cached."""
+        bucket = self._analysis_cache.get(self._get_file_cache_key(pdf_path), record_stats=False)
+        return bucket is not None and self._query_hash(query) in bucket
     
     def _is_cache_valid(self, pdf_path: str, cache_key: str) -> bool:
         """Check if cached result is still valid."""
         current_key = self._get_file_cache_key(pdf_path)
         return cache_key == current_key
     
+    @staticmethod
+    def _rebind_to_path(ingested: Dict[str, Any], pdf_path: str) -> Dict[str, Any]:
+        """Return ingestion results re-labelled for another path with identical content."""
+        metadata = ingested['metadata']
+        if metadata.get('file_path') == pdf_path:
+            return ingested
+        
+        documents = ingested['documents'].with_shared(source=pdf_path, file_path=pdf_path, source_file=pdf_path)
+        return {'metadata': {**metadata, 'file_path': pdf_path}, 'documents': documents}
+    
+    def _lookup_ingested(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return cached ingestion results from memory or the persistent store."""
+        documents = self._documents_cache.get(cache_key)
+        metadata = self._metadata_cache.get(cache_key)
+        if documents is not None and metadata is not None:
+            return {'metadata': metadata, 'documents': documents}
+        
+        # Check persistent store before touching PyMuPDF
+        if self.store is not None:
+            stored = self.store.get(cache_key)
+            if stored is not None:
+                self._metadata_cache[cache_key] = stored['metadata']
+                self._documents_cache[cache_key] = stored['documents']
+                return stored
+        
+        return None
+    
+    def _get_chunk_index(self, cache_key: str) -> Optional[ChunkIndex]:
+        """Return the BM25 chunk index for cached documents, building it on first use."""
+        index = self._index_cache.get(cache_key)
+        if index is None:
+            documents = self._documents_cache.get(cache_key)
+            if documents is None:
+                return None
+            index = ChunkIndex(
+                None if section in self.unindexed_sections else text
+                for text, section in zip(documents.texts(), documents.column('section'))
+            )
+            self._index_cache[cache_key] = index
+        return index
+    
+    def _get_section_index(self, cache_key: str) -> Optional[Dict[str, List[int]]]:
+        """Return section -> chunk indices for cached documents, building it on first use."""
+        sections = self._section_cache.get(cache_key)
+        if sections is None:
+            documents = self._documents_cache.get(cache_key)
+            if documents is None:
+                return None
+            sections = self._section_cache[cache_key] = build_section_index(documents.column('section'))
+        return sections
+    
+    def _previous_page_chunks(self, pdf_path: str, cache_key: str) -> Dict[str, List[str]]:
+        """Map page hash -> chunk texts from the previous cached revision of this path."""
+        path = os.path.abspath(pdf_path)
+        previous = self._previous_fingerprints.get(path)
+        if previous is None and self.store is not None:
+            previous = self.store.get_source(path)
+        if not previous or previous == cache_key:
+            return {}
+        
+        ingested = self._lookup_ingested(previous)
+        if ingested is None:
+            return {}
+        
+        # Chunks of a page are contiguous; keep the first page seen for each hash
+        table = ingested['documents']
+        pages: Dict[str, List[str]] = {}
+        rows = zip(table.column('page'), table.column('page_hash'), table.texts())
+        for (_, doc_hash), group in groupby(rows, key=lambda row: row[:2]):
+            if doc_hash and doc_hash not in pages:
+                pages[doc_hash] = [text for _, _, text in group]
+        return pages
+    
+    def _cache_ingested(self, cache_key: str, ingested: Dict[str, Any]):
+        """Merge freshly parsed results into the persistent store and the in-memory caches.
+        
+        Once persisted, the cached table is swapped for the store's memory-mapped copy so
+        the chunk text is shared with other processes rather than held on the heap.
+        """
+        if self.store is not None:
+            try:
+                mapped = self.store.put(cache_key, ingested['metadata'], ingested['documents'])
+                if mapped is not None:
+                    ingested['documents'] = mapped
+                self.store.put_source(os.path.abspath(ingested['metadata']['file_path']), cache_key)
+            except Exception as e:
+                print(f"[WARNING] Failed to persist PDF chunks: {str(e)}")
+        
+        self._metadata_cache[cache_key] = ingested['metadata']
+        self._documents_cache[cache_key] = ingested['documents']
+        self._index_cache.pop(cache_key, None)
+        self._section_cache.pop(cache_key, None)
+        self._get_chunk_index(cache_key)
+    
+    def ingest_pdf(self, pdf_path: str) -> Dict[str, Any]:
+        """Parse a PDF once and return its metadata and split chunks together.
+        
+        Concurrent requests for the same content share one parse.
+        """
+        cache_key = self._get_file_cache_key(pdf_path)
+        
+        cached = self._lookup_ingested(cache_key)
+        if cached is not None:
+            return self._rebind_to_path(cached, pdf_path)
+        
+        def _parse() -> Dict[str, Any]:
+            # Another caller may have finished the parse while we waited
+            cached = self._lookup_ingested(cache_key)
+            if cached is not None:
+                return cached
+            ingested = parse_pdf(
+                pdf_path, self.splitter_config, self._previous_page_chunks(pdf_path, cache_key),
+                self.extraction_backend, self.page_workers
+            )
+            self._cache_ingested(cache_key, ingested)
+            return ingested
+        
+        return self._rebind_to_path(self._run_coalesced(('ingest', cache_key), _parse), pdf_path)
+    
+    def iter_chunks(self, pdf_path: str) -> Tuple[Dict[str, Any], Iterator[Document]]:
+        """Return (metadata, chunk stream) for a PDF without materializing a cold parse up front.
+        
+        Cached documents are replayed directly. On a miss, pages are parsed lazily and the
+        chunks are cached once the stream has been fully consumed; the metadata dict is
+        complete at that point.
+        """
+        cache_key = self._get_file_cache_key(pdf_path)
+        
+        cached = self._lookup_ingested(cache_key)
+        if cached is not None:
+            cached = self._rebind_to_path(cached, pdf_path)
+            return cached['metadata'], iter(cached['documents'])
+        
+        metadata: Dict[str, Any] = {}
+        
+        def _stream() -> Iterator[Document]:
+            # Share a parse already in flight for the same content
+            key = ('ingest', cache_key)
+            future, owner = self._claim_inflight(key)
+            if not owner:
+                ingested = future.result()
+                if ingested is not None:
+                    ingested = self._rebind_to_path(ingested, pdf_path)
+                    metadata.update(ingested['metadata'])
+                    yield from ingested['documents']
+                    return
+            
+            ingested = None
+            try:
+                processed_docs = []
+                reuse_pages = self._previous_page_chunks(pdf_path, cache_key)
+                for doc in stream_pdf(pdf_path, self.splitter_config, metadata, reuse_pages,
+                                      self.extraction_backend, self.page_workers):
+                    processed_docs.append(doc)
+                    yield doc
+                
+                for doc in processed_docs:
+                    doc.metadata['total_chunks'] = len(processed_docs)
+                ingested = {'metadata': metadata, 'documents': ChunkTable.from_documents(processed_docs)}
+                self._cache_ingested(cache_key, ingested)
+            finally:
+                # Also runs if the stream is abandoned; waiters then parse for themselves
+                if owner:
+                    self._release_inflight(key, future, ingested)
+        
+        return metadata, _stream()
+    
+    def ingest_pdfs(self, pdf_files: Optional[List[str]] = None, max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Ingest many PDFs in parallel on the shared process pool and merge results into the caches.
+        
+        Defaults to every PDF under base_dir. Files already cached (in memory or on disk)
+        are not re-parsed, and identical files are parsed once. Returns results by path;
+        files that fail to parse are reported under an 'error' key.
+        """
+        pdf_files = self.find_pdf_files() if pdf_files is None else pdf_files
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, List[str]] = {}
+        
+        for pdf_path in pdf_files:
+            try:
+                cache_key = self._get_file_cache_key(pdf_path)
+            except Exception as e:
+                results[pdf_path] = {'error': f"Failed to read PDF: {str(e)}"}
+                continue
+            
+            cached = self._lookup_ingested(cache_key)
+            if cached is not None:
+                results[pdf_path] = self._rebind_to_path(cached, pdf_path)
+            else:
+                pending.setdefault(cache_key, []).append(pdf_path)
+        
+        if not pending:
+            return results
+        
+        parsed: Dict[str, Dict[str, Any]] = {}
+        # One pool is reused across calls; its size does not depend on the batch
+        workers = max_workers or os.cpu_count() or 1
+        
+        if len(pending) > 1 and workers > 1:
+            executor = None
+            try:
+                executor = get_process_pool(workers)
+                futures = {
+                    cache_key: executor.submit(
+                        parse_pdf, paths[0], self.splitter_config, self._previous_page_chunks(paths[0], cache_key),
+                        self.extraction_backend
+                    )
+                    for cache_key, paths in pending.items()
+                }
+                for cache_key, future in futures.items():
+                    try:
+                        parsed[cache_key] = future.result()
+                    except BrokenExecutor:
+                        raise
+                    except Exception as e:
+                        parsed[cache_key] = {'error': f"Processing failed: {str(e)}"}
+            except Exception as e:
+                if isinstance(e, BrokenExecutor) and executor is not None:
+                    discard_process_pool(executor)
+                print(f"[WARNING] Parallel PDF ingestion unavailable, falling back to sequential: {str(e)}")
+                parsed = {}
+        
+        for cache_key, paths in pending.items():
+            if cache_key not in parsed:
+                try:
+                    parsed[cache_key] = parse_pdf(
+                        paths[0], self.splitter_config, self._previous_page_chunks(paths[0], cache_key),
+                        self.extraction_backend, self.page_workers
+                    )
+                except Exception as e:
+                    parsed[cache_key] = {'error': f"Processing failed: {str(e)}"}
+            
+            ingested = parsed[cache_key]
+            if 'error' not in ingested:
+                self._cache_ingested(cache_key, ingested)
+            for pdf_path in paths:
+                results[pdf_path] = ingested if 'error' in ingested else self._rebind_to_path(ingested, pdf_path)
+        
+        return results
+    
     def extract_metadata(self, pdf_path: str) -> Dict[str, Any]:
         """Extract basic metadata from PDF."""
         try:
-            loader = PyMuPDFLoader(pdf_path)
-            docs = loader.load()
-            
-            metadata = {
-                'file_path': pdf_path,
-                'file_size': os.path.getsize(pdf_path),
-                'num_pages': len(docs),
-                'extraction_time': datetime.now().isoformat()
-            }
-            
-            if docs:
-                first_page = docs[0].page_content[:300]
-                metadata['preview'] = first_page.replace('\n', ' ').strip()
-            
-            return metadata
+            return self.ingest_pdf(pdf_path)['metadata']
         except Exception as e:
             return {'error': f"Failed to extract metadata: {str(e)}"}
     
     def process_pdf(self, pdf_path: str) -> List[Document]:
         """Process PDF with chunking and caching."""
         try:
-            # Check cache first
-            cache_key = self._get_file_cache_key(pdf_path)
-            
-            if cache_key in self._documents_cache:
-                if self._is_cache_valid(pdf_path, cache_key):
-                    return self._documents_cache[cache_key]
-                else:
-                    # Remove invalid cache entry
-                    del self._documents_cache[cache_key]
-            
-            # Process PDF if not cached
-            loader = PyMuPDFLoader(pdf_path)
-            raw_docs = loader.load()
-            
-            processed_docs = self.text_splitter.split_documents(raw_docs)
-            
-            for i, doc in enumerate(processed_docs):
-                doc.metadata.update({
-                    'source_file': pdf_path,
-                    'chunk_index': i,
-                    'total_chunks': len(processed_docs)
-                })
-            
-            # Cache the results
-            self._documents_cache[cache_key] = processed_docs
-            
-            return processed_docs
-            
+            return self.ingest_pdf(pdf_path)['documents'].to_documents()
         except Exception as e:
             print(f"[ERROR] PDF processing failed: {str(e)}")
             return []
@@ -227,113 +764,252 @@ class PDFAnalyzer:
                     return [f"No PDF found. Available: {', '.join(os.path.basename(p) for p in available_pdfs[:3])}"]
                 return ["Error: No PDF files found in models directory"]
             
-            documents = self.process_pdf(resolved_path)
-            if not documents:
+            try:
+                chunks = list(self.ingest_pdf(resolved_path)['documents'].texts())
+            except Exception as e:
+                print(f"[ERROR] PDF processing failed: {str(e)}")
+                chunks = []
+            if not chunks:
                 return ["Error: Processing failed"]
             
-            chunks = [doc.page_content for doc in documents]
             chunks.insert(0, f"Source: {resolved_path}")
             return chunks
             
         except Exception as e:
             return [f"Error loading PDF: {str(e)}"]
     
-    def analyze_content(self, pdf_path: Optional[str] = None, query: str = "") -> Dict[str, Any]:
-        """Analyze PDF content with categorized information extraction and caching."""
+    def pack_context(self, pdf_path: Optional[str] = None, query: str = "",
+                     token_budget: int = DEFAULT_CONTEXT_TOKENS,
+                     sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Pack the most relevant chunks of a PDF into a token budget.
+        
+        With a query, chunks are taken in BM25 order from the cached index; without one,
+        in document order (unindexed sections such as references are skipped unless
+        requested). `sections` restricts candidates to the named sections. Chunk overlaps
+        are deduplicated and the selection is returned in document order.
+        """
         try:
             resolved_path = self._resolve_pdf_path(pdf_path)
             if not resolved_path:
                 return {"error": "No PDF file found"}
             
-            # Check cache first
+            documents = self.ingest_pdf(resolved_path)['documents']
             cache_key = self._get_file_cache_key(resolved_path)
-            query_cache_key = f"{cache_key}_{hashlib.md5(query.encode()).hexdigest()}"
             
-            if query_cache_key in self._analysis_cache:
-                if self._is_cache_valid(resolved_path, cache_key):
-                    return self._analysis_cache[query_cache_key]
-                else:
-                    # Remove invalid cache entries
-                    keys_to_remove = [k for k in self._analysis_cache.keys() if k.startswith(cache_key)]
-                    for k in keys_to_remove:
-                        del self._analysis_cache[k]
+            allowed = None
+            if sections:
+                section_index = self._get_section_index(cache_key) or build_section_index(documents.column('section'))
+                names = [resolve_section(section) for section in sections]
+                missing = [section for section, name in zip(sections, names) if name not in section_index]
+                if missing:
+                    return {
+                        "error": f"Section(s) not found: {', '.join(missing)}",
+                        "available_sections": list(section_index)
+                    }
+                allowed = {chunk_id for name in names for chunk_id in section_index[name]}
             
-            # Extract metadata and process PDF (cached in process_pdf)
-            metadata = self.extract_metadata(resolved_path)
-            documents = self.process_pdf(resolved_path)
+            if query:
+                index = self._get_chunk_index(cache_key)
+                candidates = [chunk_id for chunk_id, _ in index.search(query)] if index is not None else []
+            else:
+                candidates = [
+                    chunk_id for chunk_id, section in enumerate(documents.column('section'))
+                    if allowed is not None or section not in self.unindexed_sections
+                ]
+            if allowed is not None:
+                candidates = [chunk_id for chunk_id in candidates if chunk_id in allowed]
             
-            if not documents:
-                return {"error": "Processing failed"}
+            chunk_ids, context = pack_chunks(
+                documents, candidates, token_budget, self.splitter_config['chunk_overlap'], contiguous=not query
+            )
+            return {
+                "source_file": resolved_path,
+                "query": query,
+                "token_budget": token_budget,
+                "estimated_tokens": estimate_tokens(context),
+                "chunk_indices": chunk_ids,
+                "candidate_chunks": len(candidates),
+                "context": context
+            }
+            
+        except Exception as e:
+            return {"error": f"Failed to pack context: {str(e)}"}
+    
+    def analyze_content(self, pdf_path: Optional[str] = None, query: str = "",
+                        queries: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Analyze PDF content with categorized information extraction and caching.
+        
+        Pass `queries` to answer several questions in one call: the result then carries
+        a "query_analyses" list (one ranked hit list per query, in order) instead of a
+        single "query_analysis". Categorization is computed once per file and shared by
+        every query, and uncached queries are ranked together in one pass over the index.
+        """
+        try:
+            resolved_path = self._resolve_pdf_path(pdf_path)
+            if not resolved_path:
+                return {"error": "No PDF file found"}
+            
+            # Check cache first (stale entries are dropped when the file's fingerprint changes)
+            cache_key = self._get_file_cache_key(resolved_path)
+            
+            if queries is None:
+                return self._relabel_analysis(self._answer_queries(resolved_path, cache_key, [query])[query], resolved_path)
+            
+            answers = self._answer_queries(resolved_path, cache_key, queries)
+            base = self._get_base_analysis(resolved_path, cache_key)
+            if 'error' in base:
+                return base
+            
+            result = {key: value for key, value in base.items() if key != 'query_analysis'}
+            result["query_analyses"] = [
+                answers[q].get("query_analysis", {"query": q, "relevant_chunks": []}) for q in queries
+            ]
+            return self._relabel_analysis(result, resolved_path)
+            
+        except Exception as e:
+            return {"error": f"Analysis failed: {str(e)}"}
+    
+    @staticmethod
+    def _relabel_analysis(result: Dict[str, Any], resolved_path: str) -> Dict[str, Any]:
+        """Relabel a result shared by identical content under another path."""
+        if 'error' in result or result['source_file'] == resolved_path:
+            return result
+        return {
+            **result,
+            'source_file': resolved_path,
+            'metadata': {**result['metadata'], 'file_path': resolved_path}
+        }
+    
+    def _get_base_analysis(self, resolved_path: str, cache_key: str) -> Dict[str, Any]:
+        """Return the query-independent analysis (categorization) of a PDF, cached under ''."""
+        cached = self._get_cached_analysis(cache_key, "")
+        if cached is None:
+            # Concurrent identical requests share one analysis
+            cached = self._run_coalesced(
+                ('analysis', cache_key, ""), self._analyze_uncached, resolved_path, cache_key
+            )
+        return cached
+    
+    def _answer_queries(self, resolved_path: str, cache_key: str, queries: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return full analysis results by query, ranking every uncached query in one index pass."""
+        results: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for query in dict.fromkeys(queries):
+            cached = self._get_cached_analysis(cache_key, query)
+            if cached is not None:
+                results[query] = cached
+            elif query:
+                missing.append(query)
+        
+        if "" in queries and "" not in results:
+            results[""] = self._get_base_analysis(resolved_path, cache_key)
+        if not missing:
+            return results
+        
+        base = self._get_base_analysis(resolved_path, cache_key)
+        if 'error' in base:
+            return {query: base for query in queries}
+        
+        # The chunks may have been evicted since the base analysis was cached
+        documents = self.ingest_pdf(resolved_path)['documents']
+        index = self._get_chunk_index(cache_key)
+        rankings = index.search_many(missing, top_k=self.query_top_k) if index is not None else [[] for _ in missing]
+        
+        for query, ranked in zip(missing, rankings):
+            result = {
+                **base,
+                "query_analysis": {
+                    "query": query,
+                    "relevant_chunks": [
+                        {
+                            "chunk_index": i,
+                            "score": round(score, 4),
+                            "relevance_snippet": documents.snippet(i, 300) + "..."
+                        }
+                        for i, score in ranked
+                    ]
+                }
+            }
+            self._store_analysis(cache_key, query, result)
+            results[query] = result
+        return results
+    
+    def _analyze_uncached(self, resolved_path: str, cache_key: str) -> Dict[str, Any]:
+        """Run the query-independent categorization for a PDF and cache the result."""
+        try:
+            # A concurrent caller may have finished this analysis while we waited
+            cached = self._get_cached_analysis(cache_key, "")
+            if cached is not None:
+                return cached
+            
+            # Stream chunks from a single parse (cached once fully consumed)
+            try:
+                metadata, chunks = self.iter_chunks(resolved_path)
+            except Exception as e:
+                return {"error": f"Processing failed: {str(e)}"}
             
             # Create analysis result
             analysis_result = {
                 "source_file": resolved_path,
                 "metadata": metadata,
-                "total_chunks": len(documents),
+                "total_chunks": 0,
                 "content_summary": {},
                 "extracted_sections": [],
+                "sections": {},
                 "analysis_status": "completed"
             }
             
-            # Content categorization
-            categories = {
-                "architecture": ["architecture", "model", "framework", "structure", "design", "network", "layer"],
-                "methodology": ["method", "approach", "algorithm", "technique", "procedure", "pipeline"],
-                "preprocessing": ["preprocessing", "preprocess", "data preparation", "cleaning", "normalization", "feature"],
-                "hyperparameters": ["hyperparameter", "parameter", "learning rate", "batch size", "epoch", "optimizer"],
-                "dependencies": ["import", "library", "package", "requirement", "dependency", "framework"],
-                "implementation": ["code", "implementation", "function", "class", "module", "script"],
-                "evaluation": ["evaluation", "metrics", "performance", "accuracy", "validation", "testing"],
-                "results": ["results", "findings", "conclusion", "outcome", "performance", "benchmark"]
-            }
+            # Content categorization: one scan per chunk covers every category keyword
+            keyword_counts: Counter = Counter()
+            top_chunks: Dict[str, List[Tuple[int, int]]] = {category: [] for category in self.keyword_scanner.categories}
             
-            # Analyze content
-            content_text = " ".join([doc.page_content for doc in documents]).lower()
+            # Analyze content one chunk at a time
+            try:
+                for i, doc in enumerate(chunks):
+                    chunk_counts = self.keyword_scanner.count(doc.page_content)
+                    keyword_counts.update(chunk_counts)
+                    chunk_scores = self.keyword_scanner.category_scores(chunk_counts)
+                    for category, score in chunk_scores.items():
+                        if score > 0:
+                            heapq.heappush(top_chunks[category], (score, -i))
+                            if len(top_chunks[category]) > 3:
+                                heapq.heappop(top_chunks[category])
+                    
+                    # Extract key sections
+                    if i < 10 and len(doc.page_content) > 200:
+                        analysis_result["extracted_sections"].append({
+                            "chunk_index": i,
+                            "page": doc.metadata.get('page', 'unknown'),
+                            "preview": doc.page_content[:200] + "...",
+                            "length": len(doc.page_content),
+                            "categories": {category: score for category, score in chunk_scores.items() if score > 0}
+                        })
+                    
+                    section = doc.metadata.get('section', FRONT_MATTER)
+                    analysis_result["sections"][section] = analysis_result["sections"].get(section, 0) + 1
+                    analysis_result["total_chunks"] += 1
+            except Exception as e:
+                return {"error": f"Processing failed: {str(e)}"}
             
-            for category, keywords in categories.items():
-                matches = []
-                relevance_score = 0
-                
-                for keyword in keywords:
-                    count = content_text.count(keyword)
-                    if count > 0:
-                        matches.append({"keyword": keyword, "count": count})
-                        relevance_score += count
+            if not analysis_result["total_chunks"]:
+                return {"error": "Processing failed"}
+            
+            for category, keywords in self.keyword_scanner.categories.items():
+                matches = [
+                    {"keyword": keyword, "count": keyword_counts[keyword]}
+                    for keyword in keywords if keyword_counts[keyword] > 0
+                ]
+                relevance_score = sum(match["count"] for match in matches)
                 
                 analysis_result["content_summary"][category] = {
                     "relevance_score": relevance_score,
                     "keyword_matches": matches,
-                    "confidence": min(relevance_score / 10.0, 1.0)
-                }
-            
-            # Extract key sections
-            for i, doc in enumerate(documents[:10]):
-                if len(doc.page_content) > 200:
-                    section_info = {
-                        "chunk_index": i,
-                        "page": doc.metadata.get('page', 'unknown'),
-                        "preview": doc.page_content[:200] + "...",
-                        "length": len(doc.page_content)
-                    }
-                    analysis_result["extracted_sections"].append(section_info)
-            
-            # Query-specific analysis if provided
-            if query:
-                analysis_result["query_analysis"] = {
-                    "query": query,
-                    "relevant_chunks": []
+                    "confidence": min(relevance_score / 10.0, 1.0),
+                    "top_chunks": [-neg_index for _, neg_index in sorted(top_chunks[category], reverse=True)]
                 }
-                
-                query_lower = query.lower()
-                for i, doc in enumerate(documents):
-                    if query_lower in doc.page_content.lower():
-                        analysis_result["query_analysis"]["relevant_chunks"].append({
-                            "chunk_index": i,
-                            "relevance_snippet": doc.page_content[:300] + "..."
-                        })
             
-            # Cache the analysis result
-            self._analysis_cache[query_cache_key] = analysis_result
+            # Cache the analysis result; query rankings are layered on top in _answer_queries
+            self._store_analysis(cache_key, "", analysis_result)
             
             return analysis_result
             
@@ -341,8 +1017,113 @@ class PDFAnalyzer:
             return {"error": f"Analysis failed: {str(e)}"}
     
     
+    async def aanalyze_content(self, pdf_path: Optional[str] = None, query: str = "",
+                               queries: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async variant of analyze_content that keeps parsing off the event loop."""
+        return await self.run_in_executor(self.analyze_content, pdf_path, query, queries)
+    
+    async def aingest_pdfs(self, pdf_files: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Async variant of ingest_pdfs."""
+        return await self.run_in_executor(self.ingest_pdfs, pdf_files)
+    
+    async def afind_pdf_files(self, base_dir: Optional[str] = None) -> List[str]:
+        """Async variant of find_pdf_files."""
+        return await self.run_in_executor(self.find_pdf_files, base_dir)
+    
+    @staticmethod
+    def _chunk_id(doc: Document, source_file: Optional[str] = None) -> str:
+        """ID for a chunk from its source file and content, stable across re-ingestion and restarts.
+        
+        The source (its real path, so every spelling of one file shares IDs) is part of
+        the ID so identical text in two files (a copied or re-uploaded PDF) is indexed,
+        and deleted as stale, per file; embedding the duplicate is still a cache hit in
+        the embedding layer, and the retriever returns it once.
+        """
+        source = source_file if source_file is not None else doc.metadata.get('source_file', '')
+        source = os.path.realpath(source) if source else source
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(source.encode())
+        digest.update(b'\0')
+        digest.update(doc.page_content.encode())
+        return digest.hexdigest()
+    
+    def _get_vectorstore(self, collection_name: str) -> Chroma:
+        """Return the shared vector store for this corpus, opening it once per analyzer."""
+        # One collection per models directory and embedding model, persisted next to the chunk store
+        corpus_key = f"{os.path.abspath(self.base_dir)}|{getattr(self.embeddings, 'model', '')}"
+        corpus_name = f"{collection_name}_{hashlib.md5(corpus_key.encode()).hexdigest()[:12]}"
+        
+        if corpus_name not in self._vectorstores:
+            self._vectorstores[corpus_name] = Chroma(
+                collection_name=corpus_name,
+                embedding_function=self.embeddings,
+                persist_directory=os.path.join(self.cache_dir, "chroma") if self.cache_dir else None
+            )
+        return self._vectorstores[corpus_name]
+    
+    def index_documents(self, documents: List[Document], collection_name: str = "paper_analysis",
+                        source_file: Optional[str] = None) -> int:
+        """Add chunks to the corpus vector index, embedding only chunks it has not seen.
+        
+        Chunks in unindexed sections (references) are skipped. When source_file is given,
+        vectors previously indexed for that file but absent from `documents` (pages
+        removed or edited in a new revision) are deleted. Chunks already indexed keep
+        their vectors but get their metadata refreshed, since an edit elsewhere in the
+        file can move them to another page or chunk position.
+        Returns the number of newly embedded chunks.
+        """
+        if source_file is not None:
+            source_file = os.path.realpath(source_file)
+        
+        with self._vector_lock:
+            vectorstore = self._get_vectorstore(collection_name)
+            
+            new_docs: Dict[str, Document] = {}
+            for doc in documents:
+                if doc.metadata.get('section') not in self.unindexed_sections:
+                    new_docs.setdefault(self._chunk_id(doc, source_file), doc)
+            
+            # Chroma only accepts scalar metadata values
+            metadatas: Dict[str, Dict[str, Any]] = {}
+            for chunk_id, doc in new_docs.items():
+                metadata = {k: v for k, v in doc.metadata.items() if isinstance(v, (str, int, float, bool))}
+                source = source_file or metadata.get('source_file')
+                if source:
+                    metadata['source_file'] = os.path.realpath(source)
+                metadatas[chunk_id] = metadata
+            
+            if source_file is not None:
+                indexed = vectorstore.get(where={'source_file': source_file}, include=[])['ids']
+                stale = [chunk_id for chunk_id in indexed if chunk_id not in new_docs]
+                if stale:
+                    vectorstore.delete(ids=stale)
+            
+            if new_docs:
+                existing = vectorstore.get(ids=list(new_docs), include=['metadatas'])
+                moved = [
+                    chunk_id for chunk_id, metadata in zip(existing['ids'], existing['metadatas'])
+                    if metadata != metadatas[chunk_id]
+                ]
+                if moved:
+                    vectorstore._collection.update(ids=moved, metadatas=[metadatas[chunk_id] for chunk_id in moved])
+                for chunk_id in existing['ids']:
+                    new_docs.pop(chunk_id, None)
+            
+            if new_docs:
+                docs_to_add = [
+                    Document(page_content=doc.page_content, metadata=metadatas[chunk_id])
+                    for chunk_id, doc in new_docs.items()
+                ]
+                vectorstore.add_documents(docs_to_add, ids=list(new_docs))
+            
+            return len(new_docs)
+    
     def create_retriever(self, pdf_path: Optional[str] = None, collection_name: str = "paper_analysis"):
-        """Create RAG retriever from PDF document."""
+        """Create RAG retriever from PDF document.
+        
+        The PDF is added incrementally to a persistent index shared by the whole models
+        directory, and the same retriever is returned on every call.
+        """
         try:
             resolved_path = self._resolve_pdf_path(pdf_path)
             if not resolved_path:
@@ -352,13 +1133,12 @@ class PDFAnalyzer:
             if not documents:
                 return "Error: No documents processed"
             
-            vectorstore = Chroma(
-                collection_name=collection_name, 
-                embedding_function=self.embeddings
-            )
+            self.index_documents(documents, collection_name, source_file=resolved_path)
             
-            vectorstore.add_documents(documents)
-            return vectorstore.as_retriever(search_kwargs={'k': 8})
+            vectorstore = self._get_vectorstore(collection_name)
+            if collection_name not in self._retrievers:
+                self._retrievers[collection_name] = UniqueChunkRetriever(vectorstore=vectorstore, k=8)
+            return self._retrievers[collection_name]
             
         except Exception as e:
             return f"Error creating RAG retriever: {str(e)}"
@@ -374,23 +1154,78 @@ def get_pdf_analyzer() -> PDFAnalyzer:
         _pdf_analyzer = PDFAnalyzer()
     return _pdf_analyzer
 
-def clear_pdf_cache():
-    """Clear all PDF analysis caches (useful for testing or memory management)."""
+def clear_pdf_cache(persistent: bool = False):
+    """Clear all PDF analysis caches (useful for testing or memory management).
+    
+    In-memory caches are always cleared; pass persistent=True to also wipe the on-disk chunk store.
+    """
     global _pdf_analyzer
     if _pdf_analyzer is not None:
         _pdf_analyzer._analysis_cache.clear()
         _pdf_analyzer._documents_cache.clear()
+        _pdf_analyzer._metadata_cache.clear()
+        _pdf_analyzer._section_cache.clear()
+        _pdf_analyzer._index_cache.clear()
+        _pdf_analyzer._path_fingerprints.clear()
+        _pdf_analyzer._fingerprint_paths.clear()
+        if persistent and _pdf_analyzer.store is not None:
+            _pdf_analyzer.store.clear()
 
 def get_cache_stats() -> Dict[str, int]:
-    """Get current cache statistics for monitoring."""
+    """Get current cache statistics for monitoring.
+    
+    Each in-memory cache reports its entry count plus hits, misses, evictions
+    (including TTL expirations) and approximate resident bytes. The embeddings
+    cache reports zeros until the analyzer's embedder is first used.
+    """
     global _pdf_analyzer
+    cache_names = ["analysis_cache", "documents_cache", "index_cache", "embeddings_cache"]
     if _pdf_analyzer is None:
-        return {"analysis_cache": 0, "documents_cache": 0}
+        stats = {"persistent_store": 0, "resident_bytes": 0}
+        for name in cache_names:
+            stats.update({name: 0, f"{name}_hits": 0, f"{name}_misses": 0, f"{name}_evictions": 0, f"{name}_bytes": 0})
+        return stats
     
-    return {
-        "analysis_cache": len(_pdf_analyzer._analysis_cache),
-        "documents_cache": len(_pdf_analyzer._documents_cache)
+    stats = {
+        "persistent_store": len(_pdf_analyzer.store) if _pdf_analyzer.store is not None else 0,
+        "resident_bytes": 0
+    }
+    embeddings_cache = getattr(_pdf_analyzer._embeddings, 'memory_cache', None)
+    caches = {
+        "analysis_cache": _pdf_analyzer._analysis_cache,
+        "documents_cache": _pdf_analyzer._documents_cache,
+        "index_cache": _pdf_analyzer._index_cache,
+        "embeddings_cache": embeddings_cache if embeddings_cache is not None else BoundedCache()
     }
+    for name in cache_names:
+        cache_stats = caches[name].stats()
+        stats.update({
+            name: cache_stats["entries"],
+            f"{name}_hits": cache_stats["hits"],
+            f"{name}_misses": cache_stats["misses"],
+            f"{name}_evictions": cache_stats["evictions"] + cache_stats["expirations"],
+            f"{name}_bytes": cache_stats["resident_bytes"]
+        })
+        stats["resident_bytes"] += cache_stats["resident_bytes"]
+    return stats
+
+
+def make_async_tool(sync_tool: BaseTool, pdf_analyzer: PDFAnalyzer) -> StructuredTool:
+    """Give a sync PDF tool an async variant that runs it on the analyzer's executor.
+    
+    Under the LangGraph server this keeps PyMuPDF parsing, splitting and embedding off
+    the event loop; identical concurrent requests are coalesced inside the analyzer.
+    """
+    async def _arun(**kwargs):
+        return await pdf_analyzer.run_in_executor(sync_tool.func, **kwargs)
+    
+    return StructuredTool.from_function(
+        func=sync_tool.func,
+        coroutine=_arun,
+        name=sync_tool.name,
+        description=sync_tool.description,
+        args_schema=sync_tool.args_schema
+    )
 
 
 def get_pdf_tools():
@@ -426,14 +1261,19 @@ def get_pdf_tools():
             cache_hits = 0
             state_updates = 0
             
-            for pdf_path in pdf_files[:3]:  # Limit to 3 PDFs for better performance
+            # Check which results are cached before ingestion fills the caches
+            cached_queries = {
+                pdf_path for pdf_path in pdf_files
+                if pdf_analyzer.has_cached_analysis(pdf_path, query)
+            }
+            
+            # Parse and chunk every uncached PDF in parallel
+            pdf_analyzer.ingest_pdfs(pdf_files)
+            
+            for pdf_path in pdf_files:
                 pdf_name = os.path.basename(pdf_path)
                 
-                # Check if result is cached (quick check)
-                cache_key = pdf_analyzer._get_file_cache_key(pdf_path)
-                query_cache_key = f"{cache_key}_{hashlib.md5(query.encode()).hexdigest()}"
-                
-                if query_cache_key in pdf_analyzer._analysis_cache:
+                if pdf_path in cached_queries:
                     cache_hits += 1
                 
                 analysis = pdf_analyzer.analyze_content(pdf_path, query)
@@ -442,7 +1282,7 @@ def get_pdf_tools():
                     total_chunks = analysis.get('total_chunks', 0)
                     arch_score = analysis.get('content_summary', {}).get('architecture', {}).get('relevance_score', 0)
                     method_score = analysis.get('content_summary', {}).get('methodology', {}).get('relevance_score', 0)
-                    cache_indicator = "🔄" if query_cache_key in pdf_analyzer._analysis_cache else "🆕"
+                    cache_indicator = "🔄" if pdf_path in cached_queries else "🆕"
                     
                     # Update state with analysis results
                     if _update_state_with_pdf_analysis(pdf_path, analysis):
@@ -453,7 +1293,7 @@ def get_pdf_tools():
                 else:
                     results.append(f"❌ {pdf_name}: {analysis['error']}")
             
-            summary = f"Analyzed {len(pdf_files[:3])} PDFs ({cache_hits} cached, {state_updates} saved to state)\n" + "\n".join(results)
+            summary = f"Analyzed {len(pdf_files)} PDFs ({cache_hits} cached, {state_updates} saved to state)\n" + "\n".join(results)
             return summary
         except Exception as e:
             return f"Error analyzing PDFs: {str(e)}"
@@ -508,7 +1348,70 @@ def get_pdf_tools():
         except Exception as e:
             return f"Error getting PDF summary: {str(e)}"
     
-    return [analyze_pdfs, find_pdf_files, get_pdf_summary]
+    def _format_packed(packed: Dict[str, Any]) -> str:
+        """Render a packed context result, or its error, for the agent."""
+        if "error" in packed:
+            available = packed.get('available_sections')
+            if available:
+                return f"Error: {packed['error']}. Available sections: {', '.join(available)}"
+            return f"Error: {packed['error']}"
+        if not packed['context']:
+            return f"No matching content in {os.path.basename(packed['source_file'])}"
+        header = (
+            f"📄 {os.path.basename(packed['source_file'])}: {len(packed['chunk_indices'])}/{packed['candidate_chunks']} chunks, "
+            f"~{packed['estimated_tokens']}/{packed['token_budget']} tokens"
+        )
+        return header + "\n\n" + packed['context']
+    
+    @tool
+    def get_pdf_section(section: str, pdf_name: str = "", token_budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
+        """Get the text of one section (e.g. "methods", "data", "preprocessing", "results") of a PDF, up to token_budget tokens."""
+        try:
+            return _format_packed(pdf_analyzer.pack_context(pdf_name or None, "", token_budget, sections=[section]))
+        except Exception as e:
+            return f"Error getting PDF section: {str(e)}"
+    
+    @tool
+    def get_pdf_context(query: str, pdf_name: str = "", token_budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
+        """Get the PDF passages most relevant to a query, packed into token_budget tokens in reading order."""
+        try:
+            return _format_packed(pdf_analyzer.pack_context(pdf_name or None, query, token_budget))
+        except Exception as e:
+            return f"Error getting PDF context: {str(e)}"
+    
+    @tool
+    def analyze_pdf_queries(queries: List[str], pdf_name: str = "", hits_per_query: int = 3) -> str:
+        """Answer several focused questions (e.g. preprocessing, hyperparameters, dataset) about one PDF in a single pass, returning the top-ranked passages for each."""
+        try:
+            if not queries:
+                return "Please specify at least one query"
+            
+            analysis = pdf_analyzer.analyze_content(pdf_name or None, queries=queries)
+            if "error" in analysis:
+                return f"Error: {analysis['error']}"
+            
+            lines = [f"📄 {os.path.basename(analysis['source_file'])}: {len(queries)} queries"]
+            for query_analysis in analysis['query_analyses']:
+                hits = query_analysis['relevant_chunks'][:hits_per_query]
+                lines.append(f"\n🔎 {query_analysis['query']} ({len(query_analysis['relevant_chunks'])} hits)")
+                if not hits:
+                    lines.append("  (no matching chunks)")
+                for hit in hits:
+                    snippet = ' '.join(hit['relevance_snippet'].split())
+                    lines.append(f"  [chunk {hit['chunk_index']}, score {hit['score']}] {snippet}")
+            
+            # Update state with analysis results
+            if _update_state_with_pdf_analysis(analysis['source_file'], analysis):
+                lines.append("\n💾 Analysis saved to state")
+            
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error analyzing PDF queries: {str(e)}"
+    
+    return [
+        make_async_tool(t, pdf_analyzer)
+        for t in [analyze_pdfs, find_pdf_files, get_pdf_summary, get_pdf_section, get_pdf_context, analyze_pdf_queries]
+    ]
 
 
 def get_state_tools():
@@ -0,0 +1,133 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import anyio
+import pymupdf
+import pytest
+from mcp.types import CallToolResult, EmptyResult, ListToolsResult, TextContent, Tool
+
+WORDS = ("model network layer preprocessing feature normalization learning rate batch size epoch optimizer "
+         "drug response prediction cell line gene expression dataset accuracy validation results benchmark "
+         "method approach algorithm pipeline implementation code function module").split()
+
+
+def _paper_pages(count, seed=0, lines=30):
+    """Text of `count` pages: a numbered section heading, then sentences of random vocabulary."""
+    rng = random.Random(seed)
+    headings = ["1 Introduction", "2 Methods", "3 Results", "4 Discussion"]
+    return [
+        headings[page * len(headings) // count] + "\n" + "\n".join(
+            " ".join(rng.choice(WORDS) for _ in range(12)) + "." for _ in range(lines)
+        )
+        for page in range(count)
+    ]
+
+
+def _write_pdf(path, pages):
+    """Write one PDF page per text in `pages` and return the path as a string."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_textbox(pymupdf.Rect(40, 40, 560, 800), text, fontsize=9)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def paper_pages():
+    return _paper_pages
+
+
+@pytest.fixture
+def make_pdf():
+    return _write_pdf
+
+
+class FakeMCPServer:
+    """In-process stand-in for one MCP server, with injectable delays and faults."""
+
+    def __init__(self, tools=("echo",)):
+        self.tools = [Tool(name=name, description=f"{name} tool", inputSchema={"type": "object", "properties": {}})
+                      for name in tools]
+        # Seconds every request takes; set fail_open to an exception to refuse new sessions,
+        # fail_requests to one raised by every request once it has reached the server
+        self.delay = 0.0
+        self.fail_open = None
+        self.fail_requests = None
+        self.opened = 0
+        self.calls = []
+        self.sessions = []
+
+    def kill_sessions(self):
+        """Break every open session's transport, as a container restart would."""
+        for session in self.sessions:
+            session.dead = True
+
+
+class FakeMCPSession:
+    def __init__(self, server, session_id):
+        self.server = server
+        self.id = session_id
+        self.dead = False
+
+    async def _request(self, method):
+        self.server.calls.append((method, self.id))
+        if self.dead:
+            raise anyio.BrokenResourceError()
+        if self.server.delay:
+            await asyncio.sleep(self.server.delay)
+        if self.server.fail_requests is not None:
+            raise self.server.fail_requests
+
+    async def list_tools(self, cursor=None):
+        await self._request("list_tools")
+        return ListToolsResult(tools=self.server.tools)
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        await self._request("call_tool")
+        return CallToolResult(content=[TextContent(type="text", text=f"{name} on session {self.id}")])
+
+    async def send_ping(self):
+        await self._request("send_ping")
+        return EmptyResult()
+
+
+class FakeMCPClient:
+    """MultiServerMCPClient stand-in opening sessions on FakeMCPServers."""
+
+    def __init__(self, servers):
+        self.servers = servers
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        server = self.servers[server_name]
+        if server.fail_open is not None:
+            raise server.fail_open
+        server.opened += 1
+        session = FakeMCPSession(server, server.opened)
+        server.sessions.append(session)
+        try:
+            yield session
+        finally:
+            server.sessions.remove(session)
+
+
+@pytest.fixture
+def mcp_servers():
+    """Fake MCP servers by name, served by the mcp_client fixture."""
+    return {}
+
+
+@pytest.fixture
+def add_mcp_server(mcp_servers):
+    def _add(name, tools=("echo",)):
+        server = mcp_servers[name] = FakeMCPServer(tools)
+        return server
+    return _add
+
+
+@pytest.fixture
+def mcp_client(mcp_servers):
+    return FakeMCPClient(mcp_servers)
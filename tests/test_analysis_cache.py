@@ -0,0 +1,44 @@
+from AutoDRP.utils import PDFAnalyzer
+
+
+def test_query_bucket_is_bounded(tmp_path, make_pdf, paper_pages):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None,
+                           cache_limits={"analysis_queries": {"max_entries": 2}})
+
+    for query in ["", "drug", "gene", "model"]:
+        analyzer.analyze_content(path, query)
+
+    bucket = analyzer._analysis_cache.get(analyzer._get_file_cache_key(path))
+    assert len(bucket) == 2
+    assert analyzer.has_cached_analysis(path, "model")
+    assert not analyzer.has_cached_analysis(path, "drug")
+    assert analyzer._analysis_cache.resident_bytes >= bucket.resident_bytes
+
+
+def test_queries_expire_individually(tmp_path, make_pdf, paper_pages, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("AutoDRP.cache.time.monotonic", lambda: now[0])
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None,
+                           cache_limits={"analysis": {"ttl": 10}, "analysis_queries": {"ttl": 10}})
+
+    analyzer.analyze_content(path, "")
+    now[0] += 8
+    analyzer.analyze_content(path, "drug")
+    now[0] += 8
+
+    assert not analyzer.has_cached_analysis(path, "")
+    assert analyzer.has_cached_analysis(path, "drug")
+
+
+def test_changed_file_drops_its_analyses(tmp_path, make_pdf, paper_pages):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+    analyzer.analyze_content(path, "drug")
+    old_key = analyzer._get_file_cache_key(path)
+
+    make_pdf(tmp_path / "paper.pdf", paper_pages(2, seed=1))
+
+    assert not analyzer.has_cached_analysis(path, "drug")
+    assert old_key not in analyzer._analysis_cache
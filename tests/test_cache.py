@@ -0,0 +1,98 @@
+import mmap
+
+from AutoDRP.cache import BoundedCache, approx_size
+
+
+def test_max_entries_evicts_least_recently_used():
+    evicted = []
+    cache = BoundedCache(max_entries=2, sizeof=lambda value: 1, on_evict=lambda k, v: evicted.append(k))
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+
+    assert cache.keys() == ["a", "c"]
+    assert evicted == ["b"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_max_bytes_keeps_newest_entry():
+    cache = BoundedCache(max_bytes=10, sizeof=len)
+    cache["a"] = "x" * 6
+    cache["b"] = "x" * 6
+    assert cache.keys() == ["b"]
+    assert cache.resident_bytes == 6
+
+    # An entry larger than the whole budget is still kept on its own
+    cache["c"] = "x" * 20
+    assert cache.keys() == ["c"]
+    assert cache.resident_bytes == 20
+
+
+def test_replacing_and_adjusting_track_resident_bytes():
+    cache = BoundedCache(max_bytes=10, sizeof=len)
+    cache["a"] = "xxxx"
+    cache["a"] = "xx"
+    assert cache.resident_bytes == 2
+
+    cache["b"] = "xxxx"
+    cache.adjust("b", 7)
+    # Growing "b" past the budget evicts the least recently used entry
+    assert cache.keys() == ["b"]
+    assert cache.resident_bytes == 11
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("AutoDRP.cache.time.monotonic", lambda: now[0])
+    cache = BoundedCache(ttl=5)
+    cache["a"] = 1
+    now[0] += 6
+
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+
+def test_adjust_restarts_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("AutoDRP.cache.time.monotonic", lambda: now[0])
+    cache = BoundedCache(ttl=5)
+    cache["a"] = {}
+    now[0] += 4
+    cache.adjust("a", 10)
+    now[0] += 4
+
+    assert "a" in cache
+
+def test_stats_count_hits_and_misses():
+    cache = BoundedCache()
+    cache["a"] = 1
+    cache.get("a")
+    cache.get("b")
+    cache.get("a", record_stats=False)
+    cache.record_lookup(False)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+
+def test_clear_calls_on_evict_for_every_entry():
+    evicted = []
+    cache = BoundedCache(on_evict=lambda k, v: evicted.append(k))
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.clear()
+
+    assert sorted(evicted) == ["a", "b"]
+    assert cache.resident_bytes == 0
+
+
+
+def test_approx_size_counts_mapped_length():
+    mapping = mmap.mmap(-1, 1 << 20)
+    assert approx_size(mapping) >= 1 << 20
+    mapping.close()
+    assert approx_size(mapping) < 1 << 20
@@ -0,0 +1,84 @@
+import asyncio
+import math
+
+import pytest
+from AutoDRP.embeddings import CachedEmbeddings, HashingEmbeddings, get_embeddings
+from langchain_core.embeddings import Embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeds a text as [len(text), number of words] and records every batch it is sent."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(len(text.split()))] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_hashing_embeddings_are_deterministic_and_normalized():
+    embedder = HashingEmbeddings(dim=64)
+    vector = embedder.embed_query("drug response prediction")
+
+    assert len(vector) == 64
+    assert math.isclose(sum(v * v for v in vector), 1.0)
+    assert HashingEmbeddings(dim=64).embed_query("drug response prediction") == vector
+    assert embedder.embed_query("") == [0.0] * 64
+
+
+def test_misses_are_deduplicated_and_batched():
+    underlying = CountingEmbeddings()
+    embedder = CachedEmbeddings(underlying, "counting", batch_size=2)
+    texts = ["a", "bb", "a", "ccc", "dddd"]
+
+    vectors = embedder.embed_documents(texts)
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert sorted(map(sorted, underlying.batches)) == [["a", "bb"], ["ccc", "dddd"]]
+    assert embedder.embed_documents(["bb", "a"]) == [[2.0, 1.0], [1.0, 1.0]]
+    assert len(underlying.batches) == 2
+
+
+def test_disk_cache_is_shared_across_instances(tmp_path):
+    CachedEmbeddings(CountingEmbeddings(), "counting", cache_dir=str(tmp_path)).embed_documents(["one two"])
+    underlying = CountingEmbeddings()
+    embedder = CachedEmbeddings(underlying, "counting", cache_dir=str(tmp_path))
+
+    assert embedder.embed_query("one two") == [7.0, 2.0]
+    assert underlying.batches == []
+    # Vectors are keyed by model as well as text
+    other = CachedEmbeddings(underlying, "other-model", cache_dir=str(tmp_path))
+    other.embed_query("one two")
+    assert underlying.batches == [["one two"]]
+
+
+def test_memory_cache_is_bounded():
+    underlying = CountingEmbeddings()
+    embedder = CachedEmbeddings(underlying, "counting", memory_limits={"max_entries": 2})
+
+    embedder.embed_documents(["a", "bb", "ccc"])
+
+    assert len(embedder.memory_cache) == 2
+    assert embedder.embed_query("ccc") == pytest.approx([3.0, 1.0])
+    embedder.embed_query("a")
+    assert underlying.batches[-1] == ["a"]
+
+
+def test_async_embedding_uses_the_cache():
+    underlying = CountingEmbeddings()
+    embedder = CachedEmbeddings(underlying, "counting", batch_size=1)
+
+    vectors = asyncio.run(embedder.aembed_documents(["a", "bb", "a"]))
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert asyncio.run(embedder.aembed_query("bb")) == [2.0, 1.0]
+    assert sorted(map(tuple, underlying.batches)) == [("a",), ("bb",)]
+
+
+def test_get_embeddings():
+    assert get_embeddings("hashing").model == HashingEmbeddings().model
+    with pytest.raises(ValueError):
+        get_embeddings("unknown")
@@ -0,0 +1,250 @@
+import asyncio
+import time
+
+import pytest
+from AutoDRP import mcp_manager
+
+
+class FakeDocker:
+    """docker.from_env() stand-in whose low-level API lists `running` (name -> image ID)."""
+
+    def __init__(self, running):
+        self.running = running
+        self.list_calls = 0
+        self.api = self
+
+    def containers(self):
+        self.list_calls += 1
+        return [{"Names": [f"/{name}"], "ImageID": image} for name, image in self.running.items()]
+
+
+@pytest.fixture
+def make_manager(monkeypatch, tmp_path, mcp_client):
+    """Build an MCPManager over fake servers, Docker and config; caches live under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mcp_manager.atexit, "register", lambda fn: None)
+    monkeypatch.setattr(mcp_manager, "MultiServerMCPClient", lambda config: mcp_client)
+
+    def _make(names, running=None, settings=None):
+        docker_client = FakeDocker({name: "sha256:img" for name in names} if running is None else running)
+        config = {
+            "servers": {name: {"command": "node", "args": ["dist/index.js"]} for name in names},
+            "settings": {"connection_timeout": 1, "retry_count": 2, "retry_backoff": 0.01,
+                         "retry_backoff_max": 0.05, "health_check_interval": 0, **(settings or {})}
+        }
+        monkeypatch.setattr(mcp_manager, "container_names", list(names))
+        monkeypatch.setattr(mcp_manager, "load_mcp_config", lambda *args: config)
+        monkeypatch.setattr(mcp_manager.docker, "from_env", lambda: docker_client)
+        return mcp_manager.MCPManager()
+
+    return _make
+
+
+def test_servers_connect_concurrently(make_manager, add_mcp_server):
+    for name in ["a", "b", "c"]:
+        add_mcp_server(name, tools=[f"{name}_tool"]).delay = 0.3
+    manager = make_manager(["a", "b", "c"])
+
+    async def _boot():
+        started = time.monotonic()
+        tools = await manager.initialize_all_servers()
+        return tools, time.monotonic() - started
+
+    tools, elapsed = asyncio.run(_boot())
+
+    assert {name: [tool.name for tool in server_tools] for name, server_tools in tools.items()} == \
+        {"a": ["a_tool"], "b": ["b_tool"], "c": ["c_tool"]}
+    assert elapsed < 0.8
+    assert all(status["status"] == "connected" for status in manager.server_status.values())
+
+
+def test_failed_servers_do_not_hold_up_boot(make_manager, add_mcp_server):
+    add_mcp_server("ok")
+    add_mcp_server("hung").delay = 30
+    add_mcp_server("broken").fail_open = RuntimeError("exec failed")
+    add_mcp_server("stopped")
+    manager = make_manager(["ok", "hung", "broken", "stopped"],
+                           running={"ok": "sha256:1", "hung": "sha256:2", "broken": "sha256:3"})
+
+    async def _boot():
+        started = time.monotonic()
+        tools = await manager.initialize_all_servers()
+        return tools, time.monotonic() - started
+
+    tools, elapsed = asyncio.run(_boot())
+
+    assert [tool.name for tool in tools["ok"]] == ["echo"]
+    assert tools["hung"] == tools["broken"] == tools["stopped"] == []
+    assert elapsed < 2
+    assert {name: status["status"] for name, status in manager.server_status.items()} == \
+        {"ok": "connected", "hung": "timeout", "broken": "error", "stopped": "not_running"}
+
+
+def test_tools_call_the_server(make_manager, add_mcp_server):
+    add_mcp_server("a")
+    manager = make_manager(["a"])
+
+    async def _boot_and_call():
+        tools = await manager.initialize_all_servers()
+        return await tools["a"][0].ainvoke({})
+
+    assert "echo on session 1" in str(asyncio.run(_boot_and_call()))
+
+
+def test_warm_boot_uses_cached_schemas(make_manager, add_mcp_server):
+    server = add_mcp_server("a", tools=["first"])
+    asyncio.run(make_manager(["a"]).initialize_all_servers())
+    server.delay = 0.5
+
+    async def _warm_boot():
+        manager = make_manager(["a"])
+        started = time.monotonic()
+        tools = await manager.initialize_all_servers()
+        elapsed = time.monotonic() - started
+        names = [tool.name for tool in tools["a"]]
+        # The server changed its tools; background revalidation updates the list in place
+        server.tools = [server.tools[0].model_copy(update={"name": "second"})]
+        await asyncio.gather(*manager._revalidations)
+        return manager, names, elapsed, [tool.name for tool in tools["a"]]
+
+    manager, cached_names, elapsed, refreshed_names = asyncio.run(_warm_boot())
+
+    assert cached_names == ["first"] and elapsed < 0.4
+    assert refreshed_names == ["second"]
+    assert manager.server_status["a"]["detail"] == "1 tools (refreshed)"
+
+
+def test_boot_without_a_writable_cache_dir(make_manager, add_mcp_server, tmp_path):
+    add_mcp_server("a")
+    (tmp_path / ".autodrp_cache").write_text("not a directory")
+    manager = make_manager(["a"])
+
+    assert manager.schema_cache is None
+    assert [tool.name for tool in asyncio.run(manager.initialize_all_servers())["a"]] == ["echo"]
+
+
+def test_container_snapshot_is_shared(make_manager):
+    manager = make_manager(["a", "b"], settings={"docker_status_ttl": 60})
+    docker_client = manager.docker_client
+
+    async def _snapshots():
+        first = await asyncio.gather(*(manager._get_container_snapshot() for _ in range(5)))
+        return first, await manager._get_container_snapshot()
+
+    concurrent, cached = asyncio.run(_snapshots())
+
+    assert docker_client.list_calls == 1
+    assert all(snapshot == {"a": "sha256:img", "b": "sha256:img"} for snapshot in concurrent)
+    assert cached == concurrent[0]
+
+
+def test_container_snapshot_refreshes(make_manager):
+    manager = make_manager(["a"], settings={"docker_status_ttl": 60})
+    docker_client = manager.docker_client
+
+    async def _snapshots():
+        await manager._get_container_snapshot()
+        docker_client.running["late"] = "sha256:late"
+        cached = await manager._get_container_snapshot()
+        fresh = await manager._get_container_snapshot(time.monotonic())
+        return cached, fresh
+
+    cached, fresh = asyncio.run(_snapshots())
+
+    assert "late" not in cached and fresh["late"] == "sha256:late"
+    assert docker_client.list_calls == 2
+
+
+def test_container_snapshot_expires(make_manager):
+    manager = make_manager(["a"], settings={"docker_status_ttl": 0})
+
+    async def _snapshots():
+        for _ in range(3):
+            await manager._get_container_snapshot()
+
+    asyncio.run(_snapshots())
+    assert manager.docker_client.list_calls == 3
+
+
+def test_docker_errors_give_an_empty_snapshot(make_manager):
+    manager = make_manager(["a"])
+
+    def _fail():
+        raise RuntimeError("daemon unreachable")
+
+    manager.docker_client.containers = _fail
+    assert asyncio.run(manager._get_container_snapshot()) == {}
+    assert manager._container_snapshot is None
+
+
+def test_backoff_delay_bounds(make_manager):
+    manager = make_manager(["a"], settings={"retry_backoff": 1.0, "retry_backoff_max": 8})
+
+    for attempt in range(8):
+        cap = min(8, 2 ** attempt)
+        assert all(cap / 2 <= manager._backoff_delay(attempt) <= cap for _ in range(50))
+
+
+def test_boot_makes_one_attempt_per_server(make_manager, add_mcp_server, monkeypatch):
+    add_mcp_server("a").fail_open = RuntimeError("refused")
+    manager = make_manager(["a", "b"], running={"a": "sha256:img"}, settings={"retry_count": 3})
+    attempts = []
+    connect = manager._connect_container_server
+
+    async def _counting_connect(name, *args, **kwargs):
+        attempts.append(name)
+        return await connect(name, *args, **kwargs)
+
+    monkeypatch.setattr(manager, "_connect_container_server", _counting_connect)
+    tools = asyncio.run(manager.initialize_all_servers())
+
+    assert sorted(attempts) == ["a", "b"]
+    assert tools == {"a": [], "b": []}
+
+
+async def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+def test_supervisor_reconnects_servers_that_failed_boot(make_manager, add_mcp_server):
+    server = add_mcp_server("a")
+    server.fail_open = RuntimeError("refused")
+    manager = make_manager(["a", "late"], running={"a": "sha256:img"},
+                           settings={"health_check_interval": 0.05, "docker_status_ttl": 60})
+    add_mcp_server("late")
+
+    async def _boot_then_recover():
+        tools = await manager.initialize_all_servers()
+        booted = {name: manager.server_status[name]["status"] for name in tools}
+        server.fail_open = None
+        manager.docker_client.running["late"] = "sha256:img"
+        recovered = await _wait_until(lambda: all(manager.tools.get(name) for name in ("a", "late")))
+        manager.stop_all_servers()
+        return booted, recovered
+
+    booted, recovered = asyncio.run(_boot_then_recover())
+
+    assert booted == {"a": "error", "late": "not_running"}
+    assert recovered
+
+
+def test_check_server_reestablishes_dropped_sessions(make_manager, add_mcp_server):
+    server = add_mcp_server("a")
+    manager = make_manager(["a"])
+
+    async def _drop_and_check():
+        tools = await manager.initialize_all_servers()
+        await tools["a"][0].ainvoke({"text": "hi"})
+        server.kill_sessions()
+        await manager._check_server("a")
+        return await tools["a"][0].ainvoke({"text": "hi"})
+
+    result = asyncio.run(_drop_and_check())
+
+    assert manager.server_status["a"]["status"] == "connected"
+    assert manager.server_status["a"]["detail"] == "1 tools (reconnected)"
+    assert "echo on session 2" in str(result)
+    assert server.opened == 2
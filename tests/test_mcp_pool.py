@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from AutoDRP.mcp_pool import MCPSessionPool, PooledSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, INVALID_PARAMS, ErrorData
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_calls_reuse_one_session(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client)
+
+    async def _calls():
+        for _ in range(3):
+            await pool.call("call_tool", "echo", {})
+        await pool.call("list_tools")
+        return pool.stats()
+
+    stats = _run(_calls())
+    assert server.opened == 1
+    assert stats == {"sessions": 1, "in_flight": 0, "opened": 1, "reaped": 0, "replaced": 0}
+
+
+def test_busy_sessions_open_more_up_to_the_limit(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    server.delay = 0.1
+    pool = MCPSessionPool("s", mcp_client, max_sessions=2, max_calls_per_session=2)
+
+    async def _calls():
+        await asyncio.gather(*(pool.call("call_tool", "echo", {}) for _ in range(6)))
+
+    _run(_calls())
+    assert server.opened == 2
+    assert {session_id for _, session_id in server.calls} == {1, 2}
+
+
+def test_dropped_session_is_replaced(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client)
+
+    async def _calls():
+        await pool.call("list_tools")
+        server.kill_sessions()
+        # The write fails before the request is sent, so even a tool call is retried
+        return await pool.call("call_tool", "echo", {})
+
+    result = _run(_calls())
+    assert result.content[0].text == "echo on session 2"
+    assert pool.replaced == 1
+
+
+def test_tool_calls_that_reached_the_server_are_not_retried(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client)
+
+    async def _calls():
+        await pool.call("list_tools")
+        server.fail_requests = ConnectionResetError("reset")
+        with pytest.raises(ConnectionResetError):
+            await pool.call("call_tool", "echo", {})
+        tool_calls = [call for call in server.calls if call[0] == "call_tool"]
+        # list_tools is idempotent, so it gets one retry on a fresh session
+        with pytest.raises(ConnectionResetError):
+            await pool.call("list_tools")
+        return tool_calls
+
+    assert len(_run(_calls())) == 1
+    assert server.opened == 3
+    assert pool.replaced == 3
+
+
+def test_protocol_errors_keep_the_session(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client)
+
+    async def _calls():
+        server.fail_requests = McpError(ErrorData(code=INVALID_PARAMS, message="bad arguments"))
+        with pytest.raises(McpError):
+            await pool.call("call_tool", "echo", {})
+        assert server.opened == 1
+        server.fail_requests = McpError(ErrorData(code=CONNECTION_CLOSED, message="closed"))
+        with pytest.raises(McpError):
+            await pool.call("call_tool", "echo", {})
+        server.fail_requests = None
+        await pool.call("call_tool", "echo", {})
+
+    _run(_calls())
+    assert server.opened == 2
+    assert pool.replaced == 1
+
+
+def test_idle_sessions_are_reaped(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client, idle_timeout=0.2)
+
+    async def _calls():
+        await pool.call("list_tools")
+        await asyncio.sleep(1.3)
+        return pool.stats()
+
+    stats = _run(_calls())
+    assert stats["sessions"] == 0 and stats["reaped"] == 1
+    assert server.sessions == []
+
+
+def test_ping_drops_dead_sessions(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    pool = MCPSessionPool("s", mcp_client)
+
+    async def _calls():
+        await pool.call("list_tools")
+        alive = await pool.ping()
+        server.kill_sessions()
+        dead = await pool.ping()
+        return alive, dead, pool.stats()["sessions"]
+
+    assert _run(_calls()) == (0, 1, 0)
+
+
+def test_close_ends_every_session(add_mcp_server, mcp_client):
+    server = add_mcp_server("s")
+    server.delay = 0.05
+    pool = MCPSessionPool("s", mcp_client, max_calls_per_session=1)
+
+    async def _calls():
+        await asyncio.gather(*(pool.call("list_tools") for _ in range(2)))
+        await pool.close()
+
+    _run(_calls())
+    assert server.opened == 2
+    assert server.sessions == []
+
+
+def test_pooled_session_routes_through_the_pool(add_mcp_server, mcp_client):
+    add_mcp_server("s", tools=["a", "b"])
+    pool = MCPSessionPool("s", mcp_client)
+    session = PooledSession(pool)
+
+    async def _calls():
+        listed = await session.list_tools()
+        called = await session.call_tool("a", {})
+        return [tool.name for tool in listed.tools], called.content[0].text
+
+    assert _run(_calls()) == (["a", "b"], "a on session 1")
+    assert pool.opened == 1
@@ -0,0 +1,36 @@
+import shutil
+
+from AutoDRP.mcp_schema_cache import ToolSchemaCache, dump_tools
+from mcp.types import Tool
+
+CONFIG = {"command": "docker", "args": ["exec", "-i", "s", "node", "dist/index.js"], "transport": "stdio"}
+TOOLS = [Tool(name="echo", description="Echo", inputSchema={"type": "object", "properties": {"text": {"type": "string"}}})]
+
+
+def test_key_covers_server_config_and_image():
+    key = ToolSchemaCache.key("s", CONFIG, "sha256:1")
+
+    assert ToolSchemaCache.key("s", dict(reversed(list(CONFIG.items()))), "sha256:1") == key
+    assert ToolSchemaCache.key("t", CONFIG, "sha256:1") != key
+    assert ToolSchemaCache.key("s", {**CONFIG, "args": ["exec", "-i", "s", "python"]}, "sha256:1") != key
+    assert ToolSchemaCache.key("s", CONFIG, "sha256:2") != key
+
+
+def test_round_trip(tmp_path):
+    cache = ToolSchemaCache(str(tmp_path))
+    key = ToolSchemaCache.key("s", CONFIG, "sha256:1")
+
+    assert cache.get(key) is None
+    assert cache.put(key, TOOLS)
+    assert dump_tools(ToolSchemaCache(str(tmp_path)).get(key)) == dump_tools(TOOLS)
+
+
+def test_unreadable_and_unwritable_entries(tmp_path):
+    cache = ToolSchemaCache(str(tmp_path))
+    key = ToolSchemaCache.key("s", CONFIG, "sha256:1")
+    with open(cache._path(key), "w") as f:
+        f.write("{not json")
+    assert cache.get(key) is None
+
+    shutil.rmtree(cache.cache_dir)
+    assert cache.put(key, TOOLS) is False
@@ -0,0 +1,251 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+
+import pytest
+from AutoDRP import utils
+from AutoDRP.pdf_extract import get_process_pool
+from AutoDRP.utils import PDFAnalyzer, make_async_tool
+from langchain_core.tools import tool
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """Count PDF parses: every cold ingestion path goes through stream_pdf."""
+    calls = []
+    stream_pdf = utils.stream_pdf
+
+    def _counting(pdf_path, *args, **kwargs):
+        calls.append(pdf_path)
+        return stream_pdf(pdf_path, *args, **kwargs)
+
+    monkeypatch.setattr(utils, "stream_pdf", _counting)
+    return calls
+
+
+def test_analyze_content_end_to_end(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(4))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    result = analyzer.analyze_content("paper.pdf", "drug response")
+
+    assert result["analysis_status"] == "completed"
+    assert result["source_file"] == path
+    assert result["metadata"]["num_pages"] == 4
+    assert result["total_chunks"] == len(analyzer.process_pdf(path)) > 4
+    assert set(result["sections"]) == {"introduction", "methods", "results", "discussion"}
+    assert sum(result["sections"].values()) == result["total_chunks"]
+    assert result["content_summary"]["methodology"]["relevance_score"] > 0
+    relevant = result["query_analysis"]["relevant_chunks"]
+    assert relevant and relevant[0]["score"] >= relevant[-1]["score"]
+
+
+def test_metadata_and_chunks_share_one_parse(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    analyzer.analyze_content(path)
+    analyzer.extract_metadata(path)
+    analyzer.process_pdf(path)
+    analyzer.load_content(path)
+
+    assert parse_count == [path]
+
+
+def test_missing_pdf_reports_error(tmp_path):
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    assert "error" in analyzer.analyze_content("missing.pdf")
+
+
+def test_store_serves_chunks_after_restart(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "models" / "paper.pdf", paper_pages(2))
+    cache_dir = str(tmp_path / "cache")
+    first = PDFAnalyzer(base_dir=str(tmp_path / "models"), cache_dir=cache_dir).process_pdf(path)
+
+    restarted = PDFAnalyzer(base_dir=str(tmp_path / "models"), cache_dir=cache_dir)
+
+    assert restarted.process_pdf(path) == first
+    assert parse_count == [path]
+
+
+def test_cache_key_follows_content(tmp_path, make_pdf, paper_pages):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+    key = analyzer._get_file_cache_key(path)
+
+    os.utime(path, ns=(0, 10**9))
+    assert analyzer._get_file_cache_key(path) == key
+    shutil.copy(path, tmp_path / "copy.pdf")
+    assert analyzer._get_file_cache_key(str(tmp_path / "copy.pdf")) == key
+    make_pdf(tmp_path / "paper.pdf", paper_pages(2, seed=1))
+    assert analyzer._get_file_cache_key(path) != key
+
+
+def test_copies_share_one_parse(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(2))
+    copy = shutil.copy(path, tmp_path / "copy.pdf")
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    analyzer.analyze_content(path)
+    result = analyzer.analyze_content(str(copy))
+
+    assert parse_count == [path]
+    assert result["source_file"] == str(copy)
+    assert {doc.metadata["source_file"] for doc in analyzer.process_pdf(str(copy))} == {str(copy)}
+
+
+def test_ingest_pdfs_parses_on_the_process_pool(tmp_path, make_pdf, paper_pages, parse_count):
+    paths = [make_pdf(tmp_path / f"paper{i}.pdf", paper_pages(2, seed=i)) for i in range(3)]
+    copy = str(shutil.copy(paths[0], tmp_path / "copy.pdf"))
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    results = analyzer.ingest_pdfs(paths + [copy, str(broken)], max_workers=2)
+
+    # Parsed in worker processes, not through this process's stream_pdf
+    assert parse_count == []
+    assert "error" in results[str(broken)]
+    assert results[copy]["metadata"]["file_path"] == copy
+    assert results[copy]["documents"].to_documents()[0].page_content == results[paths[0]]["documents"].text(0)
+    for path in paths:
+        assert analyzer.process_pdf(path) == results[path]["documents"].to_documents()
+    assert parse_count == []
+
+
+def test_process_pool_is_shared():
+    assert get_process_pool(2) is get_process_pool(2)
+
+
+def test_stream_pdf_yields_pages_as_they_are_read(tmp_path, make_pdf, paper_pages):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(3))
+    metadata = {}
+    stream = utils.stream_pdf(path, PDFAnalyzer(cache_dir=None).splitter_config, metadata)
+
+    first = next(stream)
+    assert metadata["num_pages"] == 1
+    assert first.metadata["page"] == 0 and first.metadata["chunk_index"] == 0
+
+    rest = list(stream)
+    assert metadata["num_pages"] == 3
+    assert [doc.metadata["chunk_index"] for doc in [first] + rest] == list(range(len(rest) + 1))
+
+
+def test_iter_chunks_caches_only_a_finished_stream(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(3))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+    cache_key = analyzer._get_file_cache_key(path)
+
+    _, chunks = analyzer.iter_chunks(path)
+    next(chunks)
+    chunks.close()
+    assert analyzer._lookup_ingested(cache_key) is None
+
+    metadata, chunks = analyzer.iter_chunks(path)
+    streamed = list(chunks)
+    assert metadata["num_pages"] == 3
+    assert {doc.metadata["total_chunks"] for doc in streamed} == {len(streamed)}
+    assert analyzer.process_pdf(path) == streamed
+    assert parse_count == [path, path]
+
+
+@pytest.mark.parametrize("restart", [False, True])
+def test_edited_pdf_reuses_unchanged_pages(tmp_path, make_pdf, paper_pages, restart):
+    pages = paper_pages(4)
+    path = make_pdf(tmp_path / "models" / "paper.pdf", pages)
+    cache_dir = str(tmp_path / "cache")
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path / "models"), cache_dir=cache_dir)
+    analyzer.process_pdf(path)
+
+    pages[2] = paper_pages(4, seed=1)[2]
+    make_pdf(tmp_path / "models" / "paper.pdf", pages)
+    if restart:
+        # The previous revision is found through the store's path record
+        analyzer = PDFAnalyzer(base_dir=str(tmp_path / "models"), cache_dir=cache_dir)
+    ingested = analyzer.ingest_pdf(path)
+
+    assert ingested["metadata"]["reused_pages"] == 3
+    fresh = PDFAnalyzer(base_dir=str(tmp_path / "models"), cache_dir=None).process_pdf(path)
+    assert ingested["documents"].to_documents() == fresh
+
+
+def test_concurrent_async_requests_share_one_parse(tmp_path, make_pdf, paper_pages, parse_count):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(3))
+    analyzer = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+
+    async def _analyze():
+        return await asyncio.gather(*(analyzer.aanalyze_content(path, "drug") for _ in range(6)))
+
+    results = asyncio.run(_analyze())
+
+    assert parse_count == [path]
+    assert all(result == results[0] for result in results)
+
+
+def test_waiters_retry_when_the_owner_fails():
+    analyzer = PDFAnalyzer(cache_dir=None)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def _work():
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError("owner failed")
+        return "ok"
+
+    def _owner():
+        try:
+            analyzer._run_coalesced(("key",), _work)
+        except RuntimeError:
+            pass
+
+    owner = threading.Thread(target=_owner)
+    owner.start()
+    started.wait(5)
+    waiter_result = []
+    waiter = threading.Thread(target=lambda: waiter_result.append(analyzer._run_coalesced(("key",), _work)))
+    waiter.start()
+    # Let the waiter block on the owner's future before the owner fails
+    time.sleep(0.2)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert waiter_result == ["ok"]
+    assert len(calls) == 2
+
+
+def test_async_tools_run_off_the_event_loop():
+    analyzer = PDFAnalyzer(cache_dir=None)
+
+    @tool
+    def current_thread() -> str:
+        """Name of the thread running the tool."""
+        return threading.current_thread().name
+
+    async_tool = make_async_tool(current_thread, analyzer)
+
+    assert asyncio.run(async_tool.ainvoke({})).startswith("pdf")
+    assert async_tool.invoke({}) == threading.current_thread().name
+
+
+def test_batched_queries_match_single_queries(tmp_path, make_pdf, paper_pages, monkeypatch):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(3))
+    queries = ["drug response", "learning rate", "drug response", "gene expression"]
+    batched = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+    passes = []
+    search_many = utils.ChunkIndex.search_many
+    monkeypatch.setattr(utils.ChunkIndex, "search_many",
+                        lambda index, *args, **kwargs: passes.append(args) or search_many(index, *args, **kwargs))
+
+    result = batched.analyze_content(path, queries=queries)
+
+    assert len(passes) == 1
+    single = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None)
+    assert result["query_analyses"] == [single.analyze_content(path, query)["query_analysis"] for query in queries]
+    assert "query_analysis" not in result
@@ -0,0 +1,84 @@
+import json
+import mmap
+import pickle
+
+from AutoDRP.pdf_chunks import ChunkTable
+from langchain_core.documents import Document
+
+
+def _documents():
+    return [
+        Document(page_content="Alpha chunk", metadata={'source': 'a.pdf', 'page': 0, 'section': 'abstract'}),
+        Document(page_content="Beta été chunk", metadata={'source': 'a.pdf', 'page': 0, 'section': 'methods',
+                                                              'tags': ['x']}),
+        Document(page_content="Gamma chunk", metadata={'source': 'a.pdf', 'page': 1, 'section': 'methods'}),
+    ]
+
+
+def test_columns_factor_out_shared_metadata():
+    table = ChunkTable.from_documents(_documents())
+
+    assert table.shared == {'source': 'a.pdf'}
+    assert table.column('page') == [0, 0, 1]
+    assert table.column('section') == ['abstract', 'methods', 'methods']
+    assert table.get(0, 'tags', 'none') == 'none'
+    assert table.to_documents() == _documents()
+
+
+def test_text_and_snippet_decode_utf8():
+    table = ChunkTable.from_documents(_documents())
+
+    assert list(table.texts()) == [doc.page_content for doc in _documents()]
+    assert table.text(1) == "Beta été chunk"
+    assert table.snippet(1, 7) == "Beta ét"
+
+
+def test_payload_round_trip():
+    table = ChunkTable.from_documents(_documents())
+    payload = json.loads(json.dumps(table.to_payload()))
+    restored = ChunkTable.from_payload(payload, bytes(table.text_buffer))
+
+    assert restored.to_documents() == _documents()
+    assert 'tags' not in restored.metadata(0)
+
+
+
+def test_pickle_round_trip():
+    table = ChunkTable.from_documents(_documents())
+
+    assert pickle.loads(pickle.dumps(table)).to_documents() == _documents()
+
+
+def test_pickle_round_trip_of_mapped_table():
+    table = ChunkTable.from_documents(_documents())
+    data = bytes(table.text_buffer)
+
+    def _map():
+        mapping = mmap.mmap(-1, len(data))
+        mapping.write(data)
+        return mapping
+
+    mapped = ChunkTable.from_payload(table.to_payload(), _map(), remap=_map)
+    restored = pickle.loads(pickle.dumps(mapped))
+
+    assert isinstance(restored.text_buffer, bytes)
+    assert restored.to_documents() == _documents()
+
+
+def test_release_remaps_on_next_access():
+    data = ChunkTable.from_documents(_documents())
+    raw = bytes(data.text_buffer)
+    mappings = []
+
+    def _map():
+        mapping = mmap.mmap(-1, len(raw))
+        mapping.write(raw)
+        mappings.append(mapping)
+        return mapping
+
+    table = ChunkTable.from_payload(data.to_payload(), _map(), remap=_map)
+    table.release()
+
+    assert mappings[0].closed
+    assert table.text(2) == "Gamma chunk"
+    assert len(mappings) == 2
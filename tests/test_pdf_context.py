@@ -0,0 +1,50 @@
+from AutoDRP.pdf_context import estimate_tokens, pack_chunks
+from langchain_core.documents import Document
+
+MAX_OVERLAP = 20
+
+
+def _chunks(count, size=180, overlap=20):
+    """Consecutive chunks of one page where each repeats the last `overlap` chars of the previous."""
+    words = ' '.join(f"word{i}" for i in range(count * size))
+    documents, start = [], 0
+    for i in range(count):
+        text = words[start:start + size]
+        documents.append(Document(page_content=text, metadata={'page': 0, 'chunk_index': i, 'section': 'methods'}))
+        start += size - overlap
+    return documents
+
+
+def test_packed_text_stays_within_budget():
+    documents = _chunks(12)
+    for budget in (10, 60, 120, 250, 1000):
+        for candidates in ([5, 6, 4, 9, 0], [11, 0, 3, 7, 1, 2], list(range(12))):
+            selected, text = pack_chunks(documents, candidates, budget, MAX_OVERLAP)
+            assert estimate_tokens(text) <= budget
+            assert selected == sorted(selected)
+
+
+def test_adjacent_chunks_share_one_run():
+    documents = _chunks(4)
+    selected, text = pack_chunks(documents, [1, 2], 1000, MAX_OVERLAP)
+
+    assert selected == [1, 2]
+    assert text.count("[methods, p. 1]") == 1
+
+
+def test_contiguous_stops_at_first_misfit():
+    documents = _chunks(4)
+    documents[1] = Document(page_content="x" * 2000, metadata={'page': 1, 'chunk_index': 0})
+    budget = 150
+
+    assert pack_chunks(documents, [0, 1, 2], budget, MAX_OVERLAP, contiguous=True)[0] == [0]
+    assert pack_chunks(documents, [0, 1, 2], budget, MAX_OVERLAP)[0] == [0, 2]
+
+
+def test_oversized_top_candidate_is_truncated():
+    documents = [Document(page_content="y" * 5000, metadata={'page': 2})]
+    selected, text = pack_chunks(documents, [0], 100, MAX_OVERLAP)
+
+    assert selected == [0]
+    assert text.startswith("[front_matter, p. 3]\n")
+    assert estimate_tokens(text) <= 100
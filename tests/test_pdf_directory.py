@@ -0,0 +1,54 @@
+import os
+
+from AutoDRP.pdf_directory import PDFDirectoryIndex
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+def test_resolve_order(tmp_path):
+    for relative in ["b/DeepCDR.pdf", "a/deepcdr_supp.pdf", "a/paper.pdf", "c/graphdrp/main.pdf",
+                     ".hidden/DeepCDR.pdf", "a/notes.txt"]:
+        _touch(str(tmp_path / relative))
+    index = PDFDirectoryIndex(str(tmp_path))
+
+    assert index.files() == [str(tmp_path / p) for p in ["a/deepcdr_supp.pdf", "a/paper.pdf",
+                                                         "b/DeepCDR.pdf", "c/graphdrp/main.pdf"]]
+    assert index.resolve() == str(tmp_path / "a/deepcdr_supp.pdf")
+    # Exact filename beats an earlier filename substring match
+    assert index.resolve("DeepCDR.pdf") == str(tmp_path / "b/DeepCDR.pdf")
+    # Filename substring is case-insensitive and the first sorted path wins
+    assert index.resolve("DEEPCDR") == str(tmp_path / "a/deepcdr_supp.pdf")
+    # Path substring is the last resort
+    assert index.resolve("graphdrp") == str(tmp_path / "c/graphdrp/main.pdf")
+    assert index.resolve("missing") is None
+
+
+def test_new_files_are_picked_up(tmp_path):
+    _touch(str(tmp_path / "b.pdf"))
+    index = PDFDirectoryIndex(str(tmp_path), poll_interval=0)
+    assert index.resolve() == str(tmp_path / "b.pdf")
+
+    _touch(str(tmp_path / "a.pdf"))
+    os.utime(str(tmp_path), ns=(0, 1))
+    assert index.resolve() == str(tmp_path / "a.pdf")
+
+
+def test_empty_directory(tmp_path):
+    assert PDFDirectoryIndex(str(tmp_path)).resolve("anything") is None
+
+
+def test_symlinked_directories_are_followed_once(tmp_path):
+    shared = tmp_path / "shared"
+    _touch(str(shared / "x.pdf"))
+    models = tmp_path / "models"
+    models.mkdir()
+    os.symlink(shared, models / "linked")
+    # A link back up the tree must not loop
+    os.symlink(models, shared / "up")
+    index = PDFDirectoryIndex(str(models))
+
+    assert index.files() == [str(models / "linked" / "x.pdf")]
+    assert index.resolve("x") == str(models / "linked" / "x.pdf")
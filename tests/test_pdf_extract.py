@@ -0,0 +1,63 @@
+import pymupdf
+from AutoDRP import pdf_extract
+from AutoDRP.pdf_extract import extract_page_text, iter_native_pages, order_blocks
+from AutoDRP.utils import PDFAnalyzer
+
+
+def _block(x0, y0, x1, y1, text, kind=0):
+    return (x0, y0, x1, y1, text, 0, kind)
+
+
+def test_order_blocks_reads_columns_within_bands():
+    blocks = [
+        _block(320, 120, 580, 140, "right 1"),
+        _block(20, 40, 580, 60, "title"),
+        _block(20, 100, 280, 120, "left 1"),
+        _block(20, 140, 280, 160, "left 2"),
+        _block(320, 80, 580, 100, "right 0"),
+        _block(20, 400, 580, 420, "full-width figure caption"),
+        _block(20, 440, 280, 460, "left 3"),
+        _block(20, 480, 280, 500, "image", kind=1),
+        _block(320, 440, 580, 460, "   "),
+    ]
+
+    assert order_blocks(blocks, 600) == ["title", "left 1", "left 2", "right 0", "right 1",
+                                         "full-width figure caption", "left 3"]
+
+
+def test_extract_page_text_on_two_columns():
+    doc = pymupdf.open()
+    page = doc.new_page(width=600, height=800)
+    # Wrapped column paragraphs; the right one is drawn first, so content-stream order reads it first
+    page.insert_textbox(pymupdf.Rect(320, 60, 580, 300), " ".join(["right"] * 40))
+    page.insert_textbox(pymupdf.Rect(20, 60, 280, 300), " ".join(["left"] * 40))
+    page = pymupdf.open("pdf", doc.tobytes())[0]
+
+    assert page.get_text().split()[0] == "right"
+    words = extract_page_text(page).split()
+    assert words == ["left"] * 40 + ["right"] * 40
+
+
+def test_native_pages_match_in_parallel(tmp_path, make_pdf, paper_pages, monkeypatch):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(6))
+
+    metadata, pages = iter_native_pages(path)
+    sequential = list(pages)
+    assert metadata["total_pages"] == 6
+    assert [page.metadata["page"] for page in sequential] == list(range(6))
+    assert sequential[0].page_content.startswith("1 Introduction")
+
+    monkeypatch.setattr(pdf_extract, "PARALLEL_PAGE_THRESHOLD", 2)
+    _, pages = iter_native_pages(path, page_workers=2)
+    assert list(pages) == sequential
+
+
+def test_native_backend_chunks_like_the_loader(tmp_path, make_pdf, paper_pages):
+    path = make_pdf(tmp_path / "paper.pdf", paper_pages(3))
+    loader = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None).ingest_pdf(path)
+    native = PDFAnalyzer(base_dir=str(tmp_path), cache_dir=None, extraction_backend="native").ingest_pdf(path)
+
+    assert native["metadata"]["num_pages"] == loader["metadata"]["num_pages"] == 3
+    assert native["documents"].column("section") == loader["documents"].column("section")
+    assert [" ".join(text.split()) for text in native["documents"].texts()] == \
+        [" ".join(text.split()) for text in loader["documents"].texts()]
@@ -0,0 +1,69 @@
+import pytest
+from AutoDRP.pdf_index import ChunkIndex, KeywordScanner, tokenize
+
+
+def test_keyword_scanner_matches_whole_words_only():
+    scanner = KeywordScanner({"architecture": ["layer", "model"]})
+    counts = scanner.count("A multilayer perceptron; each Layer and two layers. Remodeling the model.")
+
+    assert counts == {"layer": 2, "model": 1}
+
+
+def test_keyword_scanner_matches_phrases_across_whitespace():
+    scanner = KeywordScanner({"hyperparameters": ["learning rate", "batch size"]})
+    counts = scanner.count("Learning\n rate 1e-3, batch  sizes of 32, learning rates decayed")
+
+    assert counts == {"learning rate": 2, "batch size": 1}
+    assert scanner.category_scores(counts) == {"hyperparameters": 3}
+
+
+def test_keyword_scanner_default_categories_share_keywords():
+    scanner = KeywordScanner()
+    scores = scanner.category_scores(scanner.count("The framework reports benchmark performance."))
+
+    assert scores["architecture"] == scores["dependencies"] == 1
+    assert scores["evaluation"] == 1
+    assert scores["results"] == 2
+
+
+TEXTS = [
+    "Graph neural network model for drug response prediction.",
+    "We normalize gene expression before training the model.",
+    "Drug response is measured as IC50 across cell lines. Drug sensitivity varies.",
+    "Training uses a learning rate of 0.001 and batch size 64.",
+]
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The IC50 of a drug, in nM.") == ["ic50", "drug", "nm"]
+
+
+def test_search_ranks_by_bm25():
+    index = ChunkIndex(TEXTS)
+    ranking = index.search("drug response")
+
+    assert [chunk_id for chunk_id, _ in ranking] == [2, 0]
+    assert ranking[0][1] > ranking[1][1] > 0
+    assert index.search("drug response", top_k=1) == ranking[:1]
+    assert index.search("unrelated words") == []
+
+
+def test_rare_terms_weigh_more():
+    index = ChunkIndex(TEXTS)
+
+    assert index.idf("ic50") > index.idf("model") > 0
+
+
+def test_none_texts_keep_ids_but_are_not_indexed():
+    index = ChunkIndex(TEXTS[:2] + [None] + TEXTS[2:])
+
+    assert index.num_chunks == 4
+    assert [chunk_id for chunk_id, _ in index.search("drug response")] == [3, 0]
+
+
+@pytest.mark.parametrize("top_k", [None, 2])
+def test_search_many_matches_search(top_k):
+    index = ChunkIndex(TEXTS)
+    queries = ["drug response", "model training", "drug model", "unrelated words", ""]
+
+    assert index.search_many(queries, top_k) == [index.search(query, top_k) for query in queries]
@@ -0,0 +1,83 @@
+import pytest
+from AutoDRP.pdf_sections import (
+    build_section_index,
+    carry_section,
+    detect_heading,
+    find_headings,
+    page_chunk_sections,
+    resolve_section,
+    split_at_headings,
+)
+
+PROSE = "We trained the model on the GDSC drug response data for 100 epochs."
+
+
+@pytest.mark.parametrize("line, section", [
+    ("3 Methods", "methods"),
+    ("3.1. Data Preprocessing", "preprocessing"),
+    ("II. RELATED WORK", "related_work"),
+    ("ABSTRACT", "abstract"),
+    ("RESULTS AND DISCUSSION", "results"),
+    ("Appendix", "appendix"),
+    ("Appendix A", "appendix"),
+    ("Appendix B.2: Hyperparameters", "appendix"),
+    ("Supplementary Methods", "appendix"),
+    ("Supplementary Note 3 - Training details", "appendix"),
+])
+def test_headings_recognized_without_context(line, section):
+    assert detect_heading(line) == section
+
+
+@pytest.mark.parametrize("line", [
+    "Method",
+    "Appendix A shows the results",
+    "Results are shown in Table 2.",
+    "3 Methods that we compare against in detail and at great length " * 2,
+    "",
+])
+def test_non_headings_without_context(line):
+    assert detect_heading(line) is None
+
+
+def test_bare_title_needs_isolation():
+    assert detect_heading("Results", "", PROSE) == "results"
+    assert detect_heading("Results", "A. Author", "") == "results"
+    assert detect_heading("Results", PROSE, "3 Methods") == "results"
+    # Wrapped paragraph line before, or a short table cell after
+    assert detect_heading("Results", "and the remaining lines of a paragraph that ran on", PROSE) is None
+    assert detect_heading("Model", "", "AUC") is None
+    # Lowercase and full-stop lines are body text
+    assert detect_heading("results", "", PROSE) is None
+    assert detect_heading("Results.", "", PROSE) is None
+
+
+def test_find_headings_offsets():
+    text = "Title of the paper\n\nAbstract\n" + PROSE + "\n1 Introduction\n" + PROSE
+    headings = find_headings(text)
+
+    assert [section for _, section in headings] == ["abstract", "introduction"]
+    assert [text[offset:].split('\n', 1)[0] for offset, _ in headings] == ["Abstract", "1 Introduction"]
+
+
+def test_references_do_not_carry_past_bibliography():
+    bibliography = "[12] A. Smith et al. Drug response. Nature, 2019.\n[13] B. Jones. arXiv:2001.0001, 2020.\n"
+    assert carry_section("references", bibliography) == "references"
+    assert carry_section("references", PROSE + "\n" + PROSE) == "appendix"
+    assert carry_section("methods", PROSE) == "methods"
+
+
+def test_chunks_follow_headings_within_a_page():
+    text = "end of the previous section.\n2 Methods\n" + PROSE + "\n3 Results\n" + PROSE
+    segments = split_at_headings(text)
+
+    assert [segment.split('\n', 1)[0] for segment in segments] == ["end of the previous section.", "2 Methods", "3 Results"]
+    assert page_chunk_sections(text, segments, "introduction") == ["introduction", "methods", "results"]
+    assert build_section_index(["introduction", None, "methods"]) == {"introduction": [0], "front_matter": [1],
+                                                                      "methods": [2]}
+
+
+def test_resolve_section_accepts_titles_and_keys():
+    assert resolve_section("Materials and Methods") == "methods"
+    assert resolve_section("related_work") == "related_work"
+    assert resolve_section("front matter") == "front_matter"
+    assert resolve_section("unknown") is None
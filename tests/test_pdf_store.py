@@ -0,0 +1,77 @@
+import os
+
+from AutoDRP import pdf_store
+from AutoDRP.pdf_chunks import ChunkTable
+from AutoDRP.pdf_store import PDFChunkStore, compute_store_version
+from langchain_core.documents import Document
+
+SPLITTER = {"chunk_size": 1000, "chunk_overlap": 200}
+
+
+def _table():
+    return ChunkTable.from_documents([
+        Document(page_content="First chunk", metadata={"source": "a.pdf", "page": 0}),
+        Document(page_content="Second chunk", metadata={"source": "a.pdf", "page": 1}),
+    ])
+
+
+def test_put_and_get_round_trip(tmp_path):
+    store = PDFChunkStore(str(tmp_path), version="v1")
+    mapped = store.put("key", {"num_pages": 2}, _table())
+
+    assert mapped.to_documents() == _table().to_documents()
+    stored = store.get("key")
+    assert stored["metadata"] == {"num_pages": 2}
+    assert stored["documents"].to_documents() == _table().to_documents()
+    assert store.get("other") is None
+    assert len(store) == 1
+
+
+def test_entries_survive_restart_with_the_same_version(tmp_path):
+    PDFChunkStore(str(tmp_path), version="v1").put("key", {}, _table())
+
+    assert PDFChunkStore(str(tmp_path), version="v1").get("key") is not None
+
+
+def test_other_versions_are_dropped(tmp_path):
+    PDFChunkStore(str(tmp_path), version="v1").put("key", {}, _table())
+    store = PDFChunkStore(str(tmp_path), version="v2")
+
+    assert store.get("key") is None
+    assert len(store) == 0
+    assert os.listdir(store.text_dir) == []
+
+
+def test_missing_text_file_is_a_miss(tmp_path):
+    store = PDFChunkStore(str(tmp_path), version="v1")
+    store.put("key", {}, _table())
+    os.remove(store._text_path("key"))
+
+    assert store.get("key") is None
+
+
+def test_fingerprints_sources_delete_and_clear(tmp_path):
+    store = PDFChunkStore(str(tmp_path), version="v1")
+    store.put_fingerprint("1:2:3:4", "abc")
+    store.put_source("/models/a.pdf", "abc")
+    store.put("a", {}, _table())
+    store.put("b", {}, _table())
+
+    reopened = PDFChunkStore(str(tmp_path), version="v1")
+    assert reopened.get_fingerprint("1:2:3:4") == "abc"
+    assert reopened.get_source("/models/a.pdf") == "abc"
+
+    reopened.delete("a")
+    assert reopened.get("a") is None and reopened.get("b") is not None
+    reopened.clear()
+    assert len(reopened) == 0 and reopened.get_fingerprint("1:2:3:4") is None
+
+
+def test_store_version_tracks_chunking_inputs(monkeypatch):
+    version = compute_store_version(SPLITTER)
+
+    assert compute_store_version(dict(SPLITTER)) == version
+    assert compute_store_version({**SPLITTER, "chunk_size": 500}) != version
+    assert compute_store_version(SPLITTER, "native") != version
+    monkeypatch.setitem(pdf_store.SECTION_HEADINGS, "methods", ["methods"])
+    assert compute_store_version(SPLITTER) != version
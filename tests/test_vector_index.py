@@ -0,0 +1,97 @@
+import os
+import shutil
+
+from AutoDRP.utils import PDFAnalyzer
+
+
+def _analyzer(models_dir):
+    return PDFAnalyzer(base_dir=models_dir, cache_dir=None, embedding_provider="hashing")
+
+
+def _count(analyzer):
+    return analyzer._get_vectorstore("paper_analysis")._collection.count()
+
+
+def test_path_spellings_share_vectors(tmp_path, monkeypatch, make_pdf, paper_pages):
+    monkeypatch.chdir(tmp_path)
+    make_pdf(tmp_path / "models" / "paper.pdf", paper_pages(3))
+    analyzer = _analyzer("./models")
+
+    counts = []
+    for spelling in ["paper.pdf", "./models/paper.pdf", str(tmp_path / "models" / "paper.pdf")]:
+        retriever = analyzer.create_retriever(spelling)
+        counts.append(_count(analyzer))
+
+    assert counts[0] > 0 and counts == [counts[0]] * 3
+    docs = retriever.invoke("drug response prediction")
+    assert len({doc.page_content for doc in docs}) == len(docs) == 8
+
+
+def test_copied_paper_is_retrieved_once(tmp_path, make_pdf, paper_pages):
+    models = tmp_path / "models"
+    make_pdf(models / "paper.pdf", paper_pages(3))
+    shutil.copy(models / "paper.pdf", models / "copy.pdf")
+    analyzer = _analyzer(str(models))
+
+    analyzer.create_retriever("paper.pdf")
+    single = _count(analyzer)
+    retriever = analyzer.create_retriever("copy.pdf")
+
+    assert _count(analyzer) == 2 * single
+    docs = retriever.invoke("gene expression dataset")
+    assert len({doc.page_content for doc in docs}) == len(docs) == 8
+
+
+def test_unchanged_chunks_get_current_metadata(tmp_path, make_pdf, paper_pages):
+    models = tmp_path / "models"
+    pages = paper_pages(3)
+    path = make_pdf(models / "paper.pdf", pages)
+    analyzer = _analyzer(str(models))
+    analyzer.create_retriever("paper.pdf")
+    before = _count(analyzer)
+
+    # A cover page shifts every existing chunk by one page
+    make_pdf(models / "paper.pdf", ["Cover page"] + pages)
+    analyzer.create_retriever("paper.pdf")
+
+    vectorstore = analyzer._get_vectorstore("paper_analysis")
+    stored = vectorstore.get(where={"source_file": os.path.realpath(path)}, include=["metadatas"])["metadatas"]
+    assert _count(analyzer) == before + 1
+    assert sorted(m["page"] for m in stored)[0] == 0
+    assert {m["total_chunks"] for m in stored} == {before + 1}
+    assert all(m["page"] >= 1 for m in stored if m["chunk_index"] > 0)
+
+
+def test_only_new_chunks_are_embedded(tmp_path, make_pdf, paper_pages):
+    models = tmp_path / "models"
+    pages = paper_pages(3)
+    path = make_pdf(models / "paper.pdf", pages)
+    cache_dir = str(tmp_path / "cache")
+    analyzer = PDFAnalyzer(base_dir=str(models), cache_dir=cache_dir, embedding_provider="hashing")
+    documents = analyzer.process_pdf(path)
+
+    assert analyzer.index_documents(documents, source_file=path) == len(documents)
+    assert analyzer.index_documents(documents, source_file=path) == 0
+    assert analyzer.create_retriever(path) is analyzer.create_retriever(path)
+
+    # The index persists next to the chunk store
+    restarted = PDFAnalyzer(base_dir=str(models), cache_dir=cache_dir, embedding_provider="hashing")
+    assert restarted.index_documents(restarted.process_pdf(path), source_file=path) == 0
+
+    # Chunks of a removed page are deleted; the other pages keep their vectors
+    make_pdf(models / "paper.pdf", pages[:2])
+    remaining = restarted.process_pdf(path)
+    assert restarted.index_documents(remaining, source_file=path) == 0
+    assert _count(restarted) == len(remaining)
+
+
+def test_unindexed_sections_are_not_embedded(tmp_path, make_pdf, paper_pages):
+    models = tmp_path / "models"
+    path = make_pdf(models / "paper.pdf", paper_pages(2) + ["References\n[1] A. Smith et al. Drug response. Nature, 2019."])
+    analyzer = _analyzer(str(models))
+    documents = analyzer.process_pdf(path)
+
+    analyzer.index_documents(documents, source_file=path)
+
+    assert any(doc.metadata["section"] == "references" for doc in documents)
+    assert _count(analyzer) == sum(doc.metadata["section"] != "references" for doc in documents)